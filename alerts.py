@@ -5,52 +5,244 @@ Notificações automáticas para falhas e problemas do sistema
 """
 
 import os
+import time
+import contextlib
+import queue
+import socket
+import atexit
 import logging
+import tempfile
+import threading
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from collections import deque
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 from pathlib import Path
 
 _ROOT = Path(__file__).parent
 
+# Quantidade de alertas mantidos em memória e no arquivo de histórico
+_HISTORY_SIZE = 100
+
+# Intervalo mínimo entre compactações completas do histórico (segundos)
+_COMPACT_INTERVAL = 60
+
+# Agrupamento de alertas enfileirados numa única mensagem do Telegram
+_BATCH_MAX_ALERTS = 10
+_BATCH_SEPARATOR = "\n\n---\n\n"
+_TELEGRAM_MAX_LENGTH = 4096
+
+# Tempo máximo aguardando a fila de envio esvaziar no encerramento (segundos)
+_SHUTDOWN_TIMEOUT = 30
+
+# Timeouts HTTP separados (conexão, leitura) e alvo do teste de conectividade
+_HTTP_TIMEOUT = (5, 25)
+_PROBE_ADDRESS = ('1.1.1.1', 443)
+_PROBE_TIMEOUT = 2
+
+# Validade de um teste de conectividade bem-sucedido (segundos)
+_PROBE_CACHE_TTL = 600
+
+# Ícones por severidade e modelo da mensagem de alerta
+_EMOJI = {
+    'info': 'ℹ️',
+    'warning': '⚠️',
+    'error': '❌',
+    'critical': '🚨'
+}
+
+# Texto puro (sem parse_mode): mensagens com '_', '*' ou '`' não são rejeitadas pelo parser
+_ALERT_TEMPLATE = """{emoji} ALERTA DO SISTEMA
+
+Tipo: {alert_type}
+Severidade: {severity}
+Horário: {timestamp}
+
+Mensagem:
+{message}
+
+Sistema: Telegram Daily Briefing
+"""
+
+def _atomic_write(path: Path, data: bytes, durable: bool = False):
+    """Substitui o conteúdo de path atomicamente; fdatasync só quando durable=True"""
+    directory = str(path.parent)
+
+    # Linux: arquivo anônimo (O_TMPFILE) ganha nome só depois de completo
+    if hasattr(os, 'O_TMPFILE'):
+        try:
+            fd = os.open(directory, os.O_TMPFILE | os.O_WRONLY, 0o644)
+        except OSError:
+            fd = None  # Sistema de arquivos sem suporte
+        if fd is not None:
+            tmp_name = f"{path}.{os.getpid()}.tmp"
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                if durable:
+                    os.fdatasync(fd)
+                os.link(f'/proc/self/fd/{fd}', tmp_name)
+                os.replace(tmp_name, path)
+                return
+            except OSError:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
+            finally:
+                os.close(fd)
+
+    # Fallback portátil: arquivo temporário nomeado + os.replace
+    with tempfile.NamedTemporaryFile(dir=directory, prefix=f".{path.name}.", delete=False) as tmp:
+        tmp.write(data)
+        tmp.flush()
+        if durable:
+            os.fsync(tmp.fileno())
+    try:
+        # NamedTemporaryFile cria com 0600: mantém as permissões do arquivo original
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(tmp.name, mode)
+        os.replace(tmp.name, path)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+
+def _build_session() -> requests.Session:
+    """Cria sessão HTTP compartilhada (keep-alive + retry de conexão)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=2, backoff_factor=0.3)
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+# Sessão reutilizada por todas as chamadas HTTP do módulo
+_session = _build_session()
+
 class AlertSystem:
     """Sistema de alertas e notificações"""
 
     def __init__(self):
         self.telegram_token = os.getenv('TELEGRAM_BOT_TOKEN')
         self.telegram_chat_id = os.getenv('TELEGRAM_CHAT_ID')
-        self.alerts_file = _ROOT / 'alerts_history.json'
+        self.alerts_file = _ROOT / 'alerts_history.ndjson'
+        self.probe_file = self.alerts_file.with_suffix('.probe.json')
+        self._last_compact = 0.0
+        self._lines_on_disk = 0
+        self._lock = threading.Lock()
         self._load_alerts_history()
 
+        # Envio para o Telegram em segundo plano (send_alert não bloqueia o pipeline)
+        self._tx_queue = queue.Queue()
+        self._tx_thread = threading.Thread(target=self._drain, name='alert-sender', daemon=True)
+        self._tx_thread.start()
+
+        # atexit executa em ordem inversa: esvazia a fila antes de compactar
+        atexit.register(self._compact, force=True)
+        atexit.register(self._shutdown)
+
     def _load_alerts_history(self):
-        """Carrega histórico de alertas"""
+        """Carrega histórico de alertas (uma entrada JSON por linha)"""
+        self.alerts_history = deque(maxlen=_HISTORY_SIZE)
+        self._last_sent = {}  # (tipo, severidade) -> horário do último envio
+        self._lines_on_disk = 0
         try:
+            self._migrate_legacy_history()
             if self.alerts_file.exists():
                 with open(self.alerts_file, 'r', encoding='utf-8') as f:
-                    self.alerts_history = json.load(f)
-            else:
-                self.alerts_history = []
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        self._lines_on_disk += 1
+                        try:
+                            entry = json.loads(line)
+                            entry['_ts'] = datetime.fromisoformat(entry['timestamp'])
+                            entry['_line'] = line if line.endswith('\n') else line + '\n'
+                        except (json.JSONDecodeError, KeyError, ValueError):
+                            continue  # Linha truncada (ex.: queda no meio da escrita)
+                        self.alerts_history.append(entry)
+                        if entry.get('sent', False):
+                            self._last_sent[(entry['type'], entry['severity'])] = entry['_ts']
         except Exception as e:
             logging.error(f"Erro ao carregar histórico de alertas: {e}")
-            self.alerts_history = []
+            self.alerts_history = deque(maxlen=_HISTORY_SIZE)
+            self._last_sent = {}
+
+    def _migrate_legacy_history(self):
+        """Converte o alerts_history.json antigo (lista JSON) para NDJSON, uma única vez"""
+        legacy_file = self.alerts_file.with_suffix('.json')
+        if self.alerts_file.exists() or not legacy_file.exists():
+            return
+        try:
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            lines = [json.dumps(entry, ensure_ascii=False) + "\n"
+                     for entry in entries[-_HISTORY_SIZE:] if isinstance(entry, dict)]
+            _atomic_write(self.alerts_file, ''.join(lines).encode('utf-8'), durable=True)
+            legacy_file.unlink()
+            logging.info(f"Histórico de alertas migrado para {self.alerts_file.name} ({len(lines)} entradas)")
+        except Exception as e:
+            logging.error(f"Erro ao migrar histórico de alertas antigo: {e}")
 
-    def _save_alerts_history(self):
-        """Salva histórico de alertas"""
+    def _save_alerts_history(self, alert_entry: dict):
+        """Acrescenta um alerta ao histórico sem reescrever o arquivo inteiro"""
         try:
-            with open(self.alerts_file, 'w', encoding='utf-8') as f:
-                json.dump(self.alerts_history[-100:], f, indent=2, ensure_ascii=False)  # Últimos 100 alertas
+            with open(self.alerts_file, 'a', encoding='utf-8') as f:
+                f.write(self._serialize_entry(alert_entry))
+            self._lines_on_disk += 1
         except Exception as e:
             logging.error(f"Erro ao salvar histórico de alertas: {e}")
+            return
+
+        self._compact()
+
+    def _compact(self, force: bool = False):
+        """Reescreve o histórico mantendo apenas as últimas entradas (no máximo a cada 60s)"""
+        if self._lines_on_disk <= _HISTORY_SIZE:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_compact < _COMPACT_INTERVAL:
+            return
+
+        try:
+            lines = [self._serialize_entry(entry) for entry in self.alerts_history
+                     if not entry.get('_pending')]  # Pendentes serão gravados pelo worker
+            # Encerramento (force) é a última gravação do processo: garante durabilidade
+            _atomic_write(self.alerts_file, ''.join(lines).encode('utf-8'), durable=force)
+            self._lines_on_disk = len(lines)
+            self._last_compact = now
+        except Exception as e:
+            logging.error(f"Erro ao compactar histórico de alertas: {e}")
+
+    @staticmethod
+    def _serialize_entry(entry: dict) -> str:
+        """Serializa uma entrada como linha NDJSON (campos internos '_' não são persistidos)"""
+        # A linha fica guardada em '_line': compactações reaproveitam o texto já gerado
+        line = entry.get('_line')
+        if line is None:
+            public = {k: v for k, v in entry.items() if not k.startswith('_')}
+            line = entry['_line'] = json.dumps(public, ensure_ascii=False) + "\n"
+        return line
 
     def send_alert(self, alert_type: str, message: str, severity: str = 'warning'):
         """Envia alerta via Telegram"""
 
-        # Cria entrada no histórico
+        # Cria entrada no histórico (datetime mantido junto da string ISO)
+        now = datetime.now()
         alert_entry = {
-            'timestamp': datetime.now().isoformat(),
+            '_ts': now,
+            'timestamp': now.isoformat(),
             'type': alert_type,
             'message': message,
             'severity': severity,
@@ -59,72 +251,110 @@ class AlertSystem:
 
         # Verifica se já foi enviado recentemente (evita spam)
         if self._should_send_alert(alert_entry):
-            success = self._send_telegram_alert(alert_type, message, severity)
-            alert_entry['sent'] = success
-
-            if success:
-                logging.info(f"✅ Alerta enviado: {alert_type} - {message}")
-            else:
-                logging.error(f"❌ Falha ao enviar alerta: {alert_type}")
+            if self._send_telegram_alert(alert_entry):
+                # Otimista: o resultado real é registrado pelo worker de envio
+                alert_entry['sent'] = True
+                alert_entry['_pending'] = True
+                self._last_sent[(alert_type, severity)] = alert_entry['_ts']
+                with self._lock:
+                    self.alerts_history.append(alert_entry)
+                return
+            logging.error(f"❌ Falha ao enviar alerta: {alert_type}")
 
         # Adiciona ao histórico
-        self.alerts_history.append(alert_entry)
-        self._save_alerts_history()
+        with self._lock:
+            self.alerts_history.append(alert_entry)
+            self._save_alerts_history(alert_entry)
 
     def _should_send_alert(self, alert_entry: dict) -> bool:
         """Verifica se o alerta deve ser enviado (evita duplicatas)"""
 
         # Verifica alertas similares nas últimas 2 horas
         cutoff_time = datetime.now() - timedelta(hours=2)
+        last_sent = self._last_sent.get((alert_entry['type'], alert_entry['severity']))
 
-        for alert in self.alerts_history:
-            alert_time = datetime.fromisoformat(alert['timestamp'])
-            if (alert_time > cutoff_time and
-                alert['type'] == alert_entry['type'] and
-                alert['severity'] == alert_entry['severity'] and
-                alert.get('sent', False)):
-                return False  # Já foi enviado recentemente
+        return not (last_sent and last_sent > cutoff_time)
 
-        return True
-
-    def _send_telegram_alert(self, alert_type: str, message: str, severity: str) -> bool:
-        """Envia alerta via Telegram"""
+    def _send_telegram_alert(self, alert_entry: dict) -> bool:
+        """Enfileira alerta para envio via Telegram"""
 
         if not self.telegram_token or not self.telegram_chat_id:
             logging.error("Telegram credentials não configuradas para alertas")
             return False
 
-        emoji_map = {
-            'info': 'ℹ️',
-            'warning': '⚠️',
-            'error': '❌',
-            'critical': '🚨'
-        }
-
-        emoji = emoji_map.get(severity, '⚠️')
-
-        alert_message = f"""{emoji} **ALERTA DO SISTEMA**
-
-**Tipo:** {alert_type.upper()}
-**Severidade:** {severity.upper()}
-**Horário:** {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
+        severity = alert_entry['severity']
+        alert_message = _ALERT_TEMPLATE.format(
+            emoji=_EMOJI.get(severity, '⚠️'),
+            alert_type=alert_entry['type'].upper(),
+            severity=severity.upper(),
+            timestamp=alert_entry['_ts'].strftime('%d/%m/%Y %H:%M:%S'),
+            message=alert_entry['message']
+        )
 
-**Mensagem:**
-{message}
-
-**Sistema:** Telegram Daily Briefing
-"""
+        self._tx_queue.put((alert_entry, alert_message))
+        return True
 
+    def _drain(self):
+        """Worker: envia alertas enfileirados, agrupando os que chegam juntos"""
+        carry = None
+        stop = False
+
+        while not stop:
+            item = carry if carry is not None else self._tx_queue.get()
+            carry = None
+            if item is None:
+                break
+
+            batch = [item]
+            size = len(item[1])
+            while len(batch) < _BATCH_MAX_ALERTS:
+                try:
+                    nxt = self._tx_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                if size + len(_BATCH_SEPARATOR) + len(nxt[1]) > _TELEGRAM_MAX_LENGTH:
+                    carry = nxt  # Não cabe; vai na próxima mensagem
+                    break
+                batch.append(nxt)
+                size += len(_BATCH_SEPARATOR) + len(nxt[1])
+
+            text = _BATCH_SEPARATOR.join(message for _, message in batch)
+            success = self._post_telegram(text)
+
+            with self._lock:
+                for alert_entry, _ in batch:
+                    alert_entry.pop('_pending', None)
+                    alert_entry.pop('_line', None)
+                    alert_entry['sent'] = success
+                    key = (alert_entry['type'], alert_entry['severity'])
+                    if success:
+                        logging.info(f"✅ Alerta enviado: {alert_entry['type']} - {alert_entry['message']}")
+                    else:
+                        logging.error(f"❌ Falha ao enviar alerta: {alert_entry['type']}")
+                        if self._last_sent.get(key) is alert_entry['_ts']:
+                            del self._last_sent[key]
+                    self._save_alerts_history(alert_entry)
+
+    def _shutdown(self):
+        """Aguarda o envio dos alertas pendentes antes de encerrar o processo"""
+        if self._tx_thread.is_alive():
+            self._tx_queue.put(None)
+            self._tx_thread.join(timeout=_SHUTDOWN_TIMEOUT)
+
+    def _post_telegram(self, text: str) -> bool:
+        """Envia o texto ao chat configurado via Telegram Bot API"""
         try:
             url = f"https://api.telegram.org/bot{self.telegram_token}/sendMessage"
             payload = {
                 'chat_id': self.telegram_chat_id,
-                'text': alert_message,
-                'parse_mode': 'Markdown',
+                'text': text,
                 'disable_web_page_preview': True
             }
 
-            response = requests.post(url, json=payload, timeout=30)
+            response = _session.post(url, json=payload, timeout=_HTTP_TIMEOUT)
 
             if response.status_code == 200:
                 result = response.json()
@@ -167,10 +397,8 @@ class AlertSystem:
             if size_mb > 50:  # Log muito grande
                 issues.append(f"Arquivo de log muito grande: {size_mb:.1f} MB")
 
-        # Verifica conectividade de rede (teste básico)
-        try:
-            requests.get('https://httpbin.org/status/200', timeout=10)
-        except:
+        # Verifica conectividade de rede (conexão TCP simples, sem HTTPS)
+        if not self._check_network():
             issues.append("Problemas de conectividade de rede detectados")
 
         # Envia alertas para problemas encontrados
@@ -183,6 +411,29 @@ class AlertSystem:
 
         return issues
 
+    def _check_network(self) -> bool:
+        """Testa conectividade, reaproveitando um sucesso recente (válido entre execuções)"""
+        # Relógio de parede: o valor precisa ser comparável entre processos
+        now = time.time()
+        try:
+            with open(self.probe_file, 'r', encoding='utf-8') as f:
+                last_ok = json.load(f).get('last_net_ok', 0.0)
+            if 0 <= now - last_ok < _PROBE_CACHE_TTL:
+                return True
+        except (OSError, ValueError, AttributeError):
+            pass
+
+        try:
+            socket.create_connection(_PROBE_ADDRESS, timeout=_PROBE_TIMEOUT).close()
+        except OSError:
+            return False
+
+        try:
+            _atomic_write(self.probe_file, json.dumps({'last_net_ok': now}).encode('utf-8'))
+        except OSError as e:
+            logging.warning(f"Não foi possível salvar cache de conectividade: {e}")
+        return True
+
     def alert_execution_failure(self, error_message: str):
         """Alerta de falha na execução"""
         self.send_alert('execution_failure', error_message, 'error')
@@ -202,22 +453,29 @@ class AlertSystem:
         last_24h = now - timedelta(hours=24)
         last_7d = now - timedelta(days=7)
 
-        alerts_24h = [a for a in self.alerts_history
-                     if datetime.fromisoformat(a['timestamp']) > last_24h]
-        alerts_7d = [a for a in self.alerts_history
-                    if datetime.fromisoformat(a['timestamp']) > last_7d]
+        alerts_24h = 0
+        alerts_7d = 0
+        sent_24h = 0
+        by_severity = {'info': 0, 'warning': 0, 'error': 0, 'critical': 0}
+
+        for alert in self.alerts_history:
+            ts = alert['_ts']
+            if ts > last_7d:
+                alerts_7d += 1
+                if ts > last_24h:
+                    alerts_24h += 1
+                    if alert.get('sent', False):
+                        sent_24h += 1
+            severity = alert['severity']
+            if severity in by_severity:
+                by_severity[severity] += 1
 
         return {
             'total_alerts': len(self.alerts_history),
-            'alerts_24h': len(alerts_24h),
-            'alerts_7d': len(alerts_7d),
-            'sent_24h': len([a for a in alerts_24h if a.get('sent', False)]),
-            'by_severity': {
-                'info': len([a for a in self.alerts_history if a['severity'] == 'info']),
-                'warning': len([a for a in self.alerts_history if a['severity'] == 'warning']),
-                'error': len([a for a in self.alerts_history if a['severity'] == 'error']),
-                'critical': len([a for a in self.alerts_history if a['severity'] == 'critical'])
-            }
+            'alerts_24h': alerts_24h,
+            'alerts_7d': alerts_7d,
+            'sent_24h': sent_24h,
+            'by_severity': by_severity
         }
 
 # Função global para facilitar uso
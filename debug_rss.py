@@ -5,6 +5,7 @@ Debug script para investigar coleta RSS
 
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
@@ -26,8 +27,15 @@ config = {
 print("🔍 Debug RSS Collection")
 print("=" * 40)
 
-collector = NewsCollector(config)
-all_news = collector.collect_all()
+rss_feeds = config['sources']['rss_feeds']
+
+with NewsCollector(config) as collector:
+    # Busca todos os feeds em paralelo (um por thread) em vez de um após o outro
+    with ThreadPoolExecutor(max_workers=max(1, min(32, len(rss_feeds)))) as executor:
+        results = list(executor.map(collector._fetch_single_feed, rss_feeds.items()))
+    rss_news = [news for feed_news in results for news in feed_news]
+
+    all_news = collector._filter_by_date_and_relevance(list(rss_news))
 
 print(f"📊 Total collected: {len(all_news)}")
 
@@ -38,9 +46,8 @@ for i, news in enumerate(all_news, 1):
     print(f"   Relevance: {news.relevance_score}")
     print(f"   URL: {news.url}")
 
-# Testar coleta RSS diretamente
+# Itens RSS brutos (antes do filtro de data/relevância)
 print("\n🧪 Testing RSS collection directly...")
-rss_news = collector._collect_from_rss()
 print(f"RSS items collected: {len(rss_news)}")
 
 for i, news in enumerate(rss_news, 1):
@@ -7,14 +7,44 @@ Configura e testa todo o sistema para produção
 import os
 import sys
 import json
+import mmap
+import importlib
 import subprocess
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Arquivos maiores que isso são validados via mmap (sem cópia intermediária)
+_MMAP_THRESHOLD = 64 * 1024
+
+# Módulos principais verificados pelo teste de imports
+_CORE_MODULES = ('news_collector', 'telegram_sender', 'content_processor', 'message_formatter')
+
+# Flags para os snippets de teste: -I isola do ambiente/site do usuário, -B não grava .pyc
+_PYTHON_FLAGS = ['-I', '-B']
+
+def _validate_json_file(path):
+    """Valida sintaxe JSON de um arquivo (o resultado é descartado)"""
+    with open(path, 'rb') as f:
+        if orjson is None:
+            json.loads(f.read())
+        elif os.fstat(f.fileno()).st_size > _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                orjson.loads(view)
+        else:
+            orjson.loads(f.read())
+
 class DeployManager:
     """Gerenciador de deploy do sistema"""
 
-    def __init__(self):
+    def __init__(self, isolated: bool = False):
         self.project_root = Path(__file__).parent
+        self.isolated = isolated  # Força teste de imports via subprocess no venv
         self.required_files = [
             'src/main.py',
             'config/sources.json',
@@ -23,35 +53,78 @@ class DeployManager:
             'requirements.txt'
         ]
 
+        # Caminhos usados com frequência, resolvidos uma única vez como str
+        root = str(self.project_root.resolve())
+        self._settings_path = os.path.join(root, 'config', 'settings.json')
+        self._sources_path = os.path.join(root, 'config', 'sources.json')
+        self._workflow_path = os.path.join(root, '.github', 'workflows', 'daily-briefing.yml')
+        self._venv_python = os.path.join(root, 'venv', 'bin', 'python')
+
+    def _run_parallel(self, commands, **kwargs):
+        """Executa comandos independentes em paralelo; retorna resultado ou exceção de cada um"""
+        def run(cmd):
+            try:
+                return subprocess.run(cmd, capture_output=True, text=True, **kwargs)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            return list(executor.map(run, commands))
+
+    def _check_imports_in_process(self):
+        """Importa os módulos principais no próprio processo; retorna a exceção, se houver"""
+        src_dir = str(self.project_root / 'src')
+        if src_dir not in sys.path:
+            sys.path.insert(0, src_dir)
+        try:
+            for module in _CORE_MODULES:
+                importlib.import_module(module)
+        except Exception as e:
+            return e
+        return None
+
     def check_prerequisites(self):
         """Verifica pré-requisitos do sistema"""
         print("🔍 Verificando pré-requisitos...")
 
         issues = []
 
-        # Verificar arquivos necessários
+        # Verificar arquivos necessários (um scandir por diretório em vez de um stat por arquivo)
+        by_dir = defaultdict(set)
         for file_path in self.required_files:
-            if not (self.project_root / file_path).exists():
+            path = self.project_root / file_path
+            by_dir[path.parent].add(path.name)
+
+        present = set()
+        for directory, names in by_dir.items():
+            try:
+                with os.scandir(directory) as it:
+                    present.update(directory / e.name for e in it if e.name in names)
+            except (FileNotFoundError, NotADirectoryError):
+                pass
+
+        for file_path in self.required_files:
+            if self.project_root / file_path not in present:
                 issues.append(f"Arquivo não encontrado: {file_path}")
 
         # Verificar se é um repositório git
         if not (self.project_root / '.git').exists():
             issues.append("Não é um repositório Git")
 
-        # Verificar Python
-        try:
-            result = subprocess.run([sys.executable, '--version'],
-                                  capture_output=True, text=True, check=True)
-            print(f"  ✅ Python: {result.stdout.strip()}")
-        except:
+        # Verificar Python e pip (em paralelo)
+        python_result, pip_result = self._run_parallel([
+            [sys.executable, '--version'],
+            [sys.executable, '-I', '-m', 'pip', '--version']
+        ])
+
+        if isinstance(python_result, subprocess.CompletedProcess) and python_result.returncode == 0:
+            print(f"  ✅ Python: {python_result.stdout.strip()}")
+        else:
             issues.append("Python não encontrado")
 
-        # Verificar pip
-        try:
-            result = subprocess.run([sys.executable, '-m', 'pip', '--version'],
-                                  capture_output=True, text=True, check=True)
+        if isinstance(pip_result, subprocess.CompletedProcess) and pip_result.returncode == 0:
             print("  ✅ Pip encontrado")
-        except:
+        else:
             issues.append("Pip não encontrado")
 
         if issues:
@@ -96,7 +169,7 @@ class DeployManager:
         """Testa o sistema completo"""
         print("\n🧪 Testando sistema...")
 
-        venv_python = self.project_root / 'venv' / 'bin' / 'python'
+        venv_python = self._venv_python
 
         # Testar imports
         print("  🔍 Testando imports...")
@@ -113,20 +186,7 @@ except Exception as e:
     print(f'❌ Import error: {e}')
     sys.exit(1)
 """
-        try:
-            result = subprocess.run([str(venv_python), '-c', test_code],
-                                  cwd=self.project_root, capture_output=True, text=True)
-            if result.returncode == 0:
-                print("  ✅ Imports funcionando")
-            else:
-                print(f"  ❌ Erro nos imports: {result.stderr}")
-                return False
-        except Exception as e:
-            print(f"  ❌ Erro ao testar imports: {e}")
-            return False
-
         # Testar pipeline (sem enviar mensagens)
-        print("  🔄 Testando pipeline...")
         test_pipeline_code = """
 import os
 import sys
@@ -173,17 +233,37 @@ except Exception as e:
     traceback.print_exc()
     sys.exit(1)
 """
-        try:
-            result = subprocess.run([str(venv_python), '-c', test_pipeline_code],
-                                  cwd=self.project_root, capture_output=True, text=True)
-            if result.returncode == 0:
-                print("  ✅ Pipeline funcionando")
-                return True
-            else:
-                print(f"  ❌ Erro no pipeline: {result.stderr}")
+        # Imports: no próprio processo; o venv só é usado se isolado ou se falhar aqui
+        # (as dependências podem estar instaladas apenas no venv)
+        import_error = None if self.isolated else self._check_imports_in_process()
+        commands = [[venv_python, *_PYTHON_FLAGS, '-c', test_pipeline_code]]
+        if self.isolated or import_error is not None:
+            if import_error is not None:
+                print(f"  ℹ️ Imports falharam neste interpretador ({import_error}), verificando no venv...")
+            commands.insert(0, [venv_python, *_PYTHON_FLAGS, '-c', test_code])
+
+        print("  🔄 Testando pipeline...")
+        results = self._run_parallel(commands, cwd=self.project_root)
+        pipeline_result = results[-1]
+
+        if len(results) > 1:
+            import_result = results[0]
+            if isinstance(import_result, Exception):
+                print(f"  ❌ Erro ao testar imports: {import_result}")
                 return False
-        except Exception as e:
-            print(f"  ❌ Erro ao testar pipeline: {e}")
+            if import_result.returncode != 0:
+                print(f"  ❌ Erro nos imports: {import_result.stderr}")
+                return False
+        print("  ✅ Imports funcionando")
+
+        if isinstance(pipeline_result, Exception):
+            print(f"  ❌ Erro ao testar pipeline: {pipeline_result}")
+            return False
+        if pipeline_result.returncode == 0:
+            print("  ✅ Pipeline funcionando")
+            return True
+        else:
+            print(f"  ❌ Erro no pipeline: {pipeline_result.stderr}")
             return False
 
     def configure_github(self):
@@ -229,10 +309,8 @@ except Exception as e:
     def _check_config_files(self):
         """Verifica arquivos de configuração"""
         try:
-            with open(self.project_root / 'config' / 'settings.json', 'r') as f:
-                json.load(f)
-            with open(self.project_root / 'config' / 'sources.json', 'r') as f:
-                json.load(f)
+            _validate_json_file(self._settings_path)
+            _validate_json_file(self._sources_path)
             return True
         except:
             return False
@@ -248,8 +326,7 @@ except Exception as e:
     def _check_dependencies(self):
         """Verifica se dependências estão instaladas"""
         try:
-            venv_python = self.project_root / 'venv' / 'bin' / 'python'
-            result = subprocess.run([str(venv_python), '-c', 'import requests, feedparser'],
+            result = subprocess.run([self._venv_python, '-c', 'import requests, feedparser'],
                                   capture_output=True, text=True)
             return result.returncode == 0
         except:
@@ -257,8 +334,7 @@ except Exception as e:
 
     def _check_github_actions(self):
         """Verifica se GitHub Actions está configurado"""
-        workflow_file = self.project_root / '.github' / 'workflows' / 'daily-briefing.yml'
-        return workflow_file.exists()
+        return os.path.exists(self._workflow_path)
 
     def run_deploy(self):
         """Executa deploy completo"""
@@ -307,6 +383,7 @@ except Exception as e:
         return True
 
 if __name__ == "__main__":
-    deployer = DeployManager()
+    # --isolated: testa imports no venv (subprocess) em vez do processo atual
+    deployer = DeployManager(isolated='--isolated' in sys.argv[1:])
     success = deployer.run_deploy()
     sys.exit(0 if success else 1)
@@ -6,12 +6,108 @@ Gerencia tamanho e rotação automática de arquivos de log
 
 import os
 import gzip
+import shutil
+import struct
 import logging
+import logging.handlers
+from contextlib import suppress
 from pathlib import Path
 from datetime import datetime, timedelta
 
 _ROOT = Path(__file__).parent
 
+# Sidecar .meta de cada backup: bytes originais e número de linhas (uint64 LE)
+_META_FORMAT = '<QQ'
+_META_SIZE = struct.calcsize(_META_FORMAT)
+
+def _open_noatime(path) -> int:
+    """Abre arquivo para leitura sem atualizar atime (O_NOATIME só existe no Linux)"""
+    noatime = getattr(os, 'O_NOATIME', 0)
+    if noatime:
+        try:
+            return os.open(path, os.O_RDONLY | noatime)
+        except PermissionError:
+            pass  # O_NOATIME exige ser dono do arquivo
+    return os.open(path, os.O_RDONLY)
+
+class _CountingReader:
+    """Envolve um arquivo binário contando bytes e linhas lidos"""
+
+    def __init__(self, f):
+        self._f = f
+        self.bytes = 0
+        self.lines = 0
+
+    def read(self, size=-1) -> bytes:
+        chunk = self._f.read(size)
+        self.bytes += len(chunk)
+        self.lines += chunk.count(b'\n')
+        return chunk
+
+def _meta_path(gz_path: str) -> str:
+    """Caminho do sidecar de um backup: briefing.log.1.gz -> briefing.log.1.meta"""
+    return (gz_path[:-3] if gz_path.endswith('.gz') else gz_path) + '.meta'
+
+def _read_meta(gz_path: str):
+    """Lê (bytes originais, linhas) do sidecar; None se ausente ou inválido"""
+    try:
+        with open(_meta_path(gz_path), 'rb') as f:
+            data = f.read(_META_SIZE)
+    except OSError:
+        return None
+    if len(data) != _META_SIZE:
+        return None
+    return struct.unpack(_META_FORMAT, data)
+
+def _gzip_namer(name: str) -> str:
+    """Nome dos backups do RotatingFileHandler: briefing.log.1 -> briefing.log.1.gz"""
+    return name + '.gz'
+
+def _gzip_rotator(source: str, dest: str):
+    """Comprime o log em dest e remove o original (executado dentro do lock do handler)"""
+    # Blocos de 1 MB, nível 6 (padrão do gzip CLI). Grava em temporário e renomeia:
+    # uma falha nunca deixa um .gz truncado
+    dest_dir, dest_name = os.path.split(dest)
+    tmp_file = os.path.join(dest_dir, f".{dest_name}.tmp")
+    with os.fdopen(_open_noatime(source), 'rb') as f_in:
+        counter = _CountingReader(f_in)
+        with gzip.open(tmp_file, 'wb', compresslevel=6) as f_out:
+            shutil.copyfileobj(counter, f_out, length=1 << 20)
+
+        # Conteúdo não será relido: libera as páginas do cache
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(f_in.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    os.replace(tmp_file, dest)
+
+    # Sidecar com tamanho e linhas: estatísticas sem descomprimir o .gz
+    with open(_meta_path(dest), 'wb') as f:
+        f.write(struct.pack(_META_FORMAT, counter.bytes, counter.lines))
+    os.unlink(source)
+
+class _GzipRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler que também desloca os sidecars .meta dos backups"""
+
+    def doRollover(self):
+        if self.backupCount > 0:
+            for i in range(self.backupCount - 1, 0, -1):
+                sfn = _meta_path(self.rotation_filename(f"{self.baseFilename}.{i}"))
+                dfn = _meta_path(self.rotation_filename(f"{self.baseFilename}.{i + 1}"))
+                if os.path.exists(sfn):
+                    os.replace(sfn, dfn)
+        super().doRollover()
+
+def create_log_handler(log_file=None, max_size_mb=10, backup_count=5, delay=False):
+    """Cria RotatingFileHandler que rotaciona comprimindo os backups em .gz"""
+    handler = _GzipRotatingFileHandler(
+        filename=str(log_file) if log_file else str(_ROOT / 'briefing.log'),
+        maxBytes=max_size_mb * 1024 * 1024,
+        backupCount=backup_count,
+        delay=delay
+    )
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
+    return handler
+
 class LogRotator:
     """Gerenciador de rotação de logs"""
 
@@ -19,6 +115,7 @@ class LogRotator:
         self.log_file = Path(log_file) if log_file else _ROOT / 'briefing.log'
         self.max_size_mb = max_size_mb
         self.backup_count = backup_count
+        self._stem = self.log_file.stem
 
     def should_rotate(self) -> bool:
         """Verifica se o log deve ser rotacionado"""
@@ -28,50 +125,67 @@ class LogRotator:
         size_mb = self.log_file.stat().st_size / (1024 * 1024)
         return size_mb >= self.max_size_mb
 
+    def _find_handler(self):
+        """Retorna o RotatingFileHandler do logger raiz que escreve neste arquivo, se houver"""
+        for handler in logging.getLogger().handlers:
+            if (isinstance(handler, logging.handlers.RotatingFileHandler)
+                    and handler.baseFilename == os.path.abspath(self.log_file)):
+                return handler
+        return None
+
     def rotate_log(self):
         """Executa rotação do arquivo de log"""
         if not self.log_file.exists():
             return
 
         try:
-            # Fecha handlers de logging se estiverem abertos
-            for handler in logging.getLogger().handlers[:]:
-                if hasattr(handler, 'baseFilename') and handler.baseFilename == str(self.log_file):
+            # Rotaciona pelo handler ativo (no lock do logging, sem perder linhas);
+            # sem handler ativo, usa um temporário com a mesma configuração
+            handler = self._find_handler()
+            if handler is not None:
+                handler.acquire()
+                try:
+                    handler.doRollover()
+                finally:
+                    handler.release()
+            else:
+                handler = create_log_handler(self.log_file, self.max_size_mb, self.backup_count, delay=True)
+                try:
+                    handler.doRollover()
+                finally:
                     handler.close()
-                    logging.getLogger().removeHandler(handler)
 
-            # Remove arquivos antigos (mantém apenas backup_count)
+            # Remove backups excedentes no formato antigo (briefing.<timestamp>.gz)
             self._cleanup_old_logs()
 
-            # Cria arquivo rotacionado
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            rotated_file = self.log_file.with_suffix(f'.{timestamp}.gz')
-
-            # Comprime o arquivo atual
-            with open(self.log_file, 'rb') as f_in:
-                with gzip.open(rotated_file, 'wb') as f_out:
-                    f_out.writelines(f_in)
-
-            # Trunca o arquivo original
-            with open(self.log_file, 'w') as f:
-                f.write(f"[{datetime.now().isoformat()}] Log rotated - Previous content compressed to {rotated_file.name}\n")
-
-            print(f"✅ Log rotated: {self.log_file.name} -> {rotated_file.name}")
+            print(f"✅ Log rotated: {self.log_file.name} -> {self.log_file.name}.1.gz")
 
         except Exception as e:
             print(f"❌ Error rotating log: {e}")
 
+    def _scan_rotated_logs(self) -> list:
+        """Lista (entrada, stat) dos logs rotacionados com uma única leitura do diretório"""
+        with os.scandir(self.log_file.parent) as it:
+            return [
+                (entry, entry.stat(follow_symlinks=False))
+                for entry in it
+                if entry.name.startswith(self._stem) and entry.name.endswith('.gz')
+                and entry.is_file(follow_symlinks=False)
+            ]
+
     def _cleanup_old_logs(self):
         """Remove arquivos de log antigos"""
         try:
-            log_files = list(self.log_file.parent.glob(f"{self.log_file.stem}*.gz"))
-            log_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+            log_files = self._scan_rotated_logs()
+            log_files.sort(key=lambda x: x[1].st_mtime, reverse=True)
 
             # Mantém apenas os mais recentes
             if len(log_files) >= self.backup_count:
                 files_to_remove = log_files[self.backup_count:]
-                for old_file in files_to_remove:
-                    old_file.unlink()
+                for old_file, _ in files_to_remove:
+                    os.unlink(old_file.path)
+                    with suppress(FileNotFoundError):
+                        os.unlink(_meta_path(old_file.path))
                     print(f"🗑️ Removed old log: {old_file.name}")
 
         except Exception as e:
@@ -95,14 +209,18 @@ class LogRotator:
 
         # Estatísticas dos logs rotacionados
         try:
-            rotated_files = list(self.log_file.parent.glob(f"{self.log_file.stem}*.gz"))
-            for rotated_file in rotated_files:
-                stat = rotated_file.stat()
-                stats['rotated_logs'].append({
+            for rotated_file, stat in self._scan_rotated_logs():
+                info = {
                     'filename': rotated_file.name,
                     'size_mb': round(stat.st_size / (1024 * 1024), 2),
                     'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
-                })
+                }
+                # Tamanho original e linhas vêm do sidecar (16 bytes, sem gzip)
+                meta = _read_meta(rotated_file.path)
+                if meta is not None:
+                    info['original_mb'] = round(meta[0] / (1024 * 1024), 2)
+                    info['lines'] = meta[1]
+                stats['rotated_logs'].append(info)
 
             # Ordena por data de modificação (mais recente primeiro)
             stats['rotated_logs'].sort(key=lambda x: x['modified'], reverse=True)
@@ -143,7 +261,8 @@ if __name__ == "__main__":
             print(f"  Main log: {stats['main_log']}")
             print(f"  Rotated logs: {len(stats['rotated_logs'])}")
             for log in stats['rotated_logs'][:3]:  # Mostra os 3 mais recentes
-                print(f"    {log['filename']}: {log['size_mb']} MB")
+                lines = f" ({log['lines']} lines)" if 'lines' in log else ""
+                print(f"    {log['filename']}: {log['size_mb']} MB{lines}")
         elif sys.argv[1] == '--check':
             check_and_rotate_logs()
     else:
@@ -5,49 +5,69 @@ Executa limpeza, otimização e verificações de saúde do sistema
 """
 
 import os
+import re
 import sys
+import heapq
 import shutil
+import fnmatch
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 _ROOT = Path(__file__).parent
 sys.path.insert(0, str(_ROOT / 'src'))
 
+def _write_lines(lines):
+    """Escreve as mensagens acumuladas com uma única chamada ao stdout"""
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+        sys.stdout.flush()
+
+# Arquivos temporários (casados pelo nome) e diretórios removidos inteiros
+_TEMP_FILE_PATTERNS = ['*.pyc', '*.tmp', '*.bak', 'test_*.json', 'test_*.bin', 'debug_*.json']
+# Todos os padrões em uma única regex, compilada uma vez e casada contra o nome do dirent
+_TEMP_FILE_RE = re.compile('|'.join(fnmatch.translate(p) for p in _TEMP_FILE_PATTERNS))
+_TEMP_DIRS = {'__pycache__'}
+# Diretórios que a varredura não percorre
+_SKIP_DIRS = {'backups'}
+
+def _walk_temp_entries(path: str):
+    """Percorre a árvore uma única vez, gerando (entrada, é_diretório) a remover"""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in _TEMP_DIRS:
+                    yield entry, True
+                elif entry.name not in _SKIP_DIRS:
+                    yield from _walk_temp_entries(entry.path)
+            elif _TEMP_FILE_RE.match(entry.name) and entry.is_file():
+                yield entry, False
+
 def cleanup_temp_files():
     """Limpa arquivos temporários"""
     print("🧹 Limpando arquivos temporários...")
 
-    temp_files = [
-        '*.pyc',
-        '__pycache__',
-        '*.tmp',
-        '*.bak',
-        'test_*.json',
-        'debug_*.json'
-    ]
-
     cleaned = 0
-    for pattern in temp_files:
-        if '*' in pattern:
-            # Remove arquivos com padrão
-            for file_path in _ROOT.rglob(pattern):
-                try:
-                    if file_path.is_file():
-                        file_path.unlink()
-                        print(f"  🗑️ Removed: {file_path}")
-                        cleaned += 1
-                except Exception as e:
-                    print(f"  ❌ Error removing {file_path}: {e}")
-        else:
-            # Remove diretório específico
-            for dir_path in _ROOT.rglob(pattern):
-                try:
-                    if dir_path.is_dir():
-                        shutil.rmtree(dir_path)
-                        print(f"  🗑️ Removed dir: {dir_path}")
-                        cleaned += 1
-                except Exception as e:
-                    print(f"  ❌ Error removing {dir_path}: {e}")
+    msgs = []  # Uma única escrita no stdout no fim, em vez de um print por arquivo
+    # Materializa antes de remover: não altera diretórios durante o scandir
+    for entry, is_dir in list(_walk_temp_entries(str(_ROOT))):
+        try:
+            if is_dir:
+                shutil.rmtree(entry.path)
+                msgs.append(f"  🗑️ Removed dir: {entry.path}")
+            else:
+                os.unlink(entry.path)
+                msgs.append(f"  🗑️ Removed: {entry.path}")
+            cleaned += 1
+        except Exception as e:
+            msgs.append(f"  ❌ Error removing {entry.path}: {e}")
+    _write_lines(msgs)
 
     print(f"✅ Limpeza concluída: {cleaned} arquivos/diretórios removidos")
     return cleaned
@@ -63,57 +83,53 @@ def optimize_state_file():
 
     try:
         import json
-        with open(state_file, 'r', encoding='utf-8') as f:
-            state = json.load(f)
+        raw = state_file.read_bytes()
+        state = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+        from content_processor import (
+            hashes_path, read_hash_records, write_hash_records, legacy_hash_records
+        )
 
-        original_urls = state.get('processed_urls', [])
-        url_timestamps = state.get('url_timestamps', {})
-        original_count = len(original_urls)
+        hashes_file = hashes_path(state_file)
         original_size = state_file.stat().st_size
+        if 'processed_urls' in state:
+            # Formato antigo (URLs completas): migra para o arquivo de hashes
+            records = legacy_hash_records(state)
+            state.pop('processed_urls', None)
+            state.pop('url_timestamps', None)
+        else:
+            records = read_hash_records(hashes_file)
+            if hashes_file.exists():
+                original_size += hashes_file.stat().st_size
+        original_count = len(records)
 
-        cutoff_date = datetime.now() - timedelta(days=30)
+        cutoff_ts = (datetime.now() - timedelta(days=30)).timestamp()
 
-        # Filtra URLs: mantém as que têm timestamp recente ou sem timestamp (conservador)
-        kept_urls = []
-        for url in original_urls:
-            ts = url_timestamps.get(url)
-            if ts is None:
-                kept_urls.append(url)  # sem data → mantém por segurança
-            else:
-                try:
-                    if datetime.fromisoformat(ts) >= cutoff_date:
-                        kept_urls.append(url)
-                except ValueError:
-                    kept_urls.append(url)  # data inválida → mantém
-
-        # Remove duplicatas preservando ordem
-        seen = set()
-        unique_urls = []
-        for url in kept_urls:
-            if url not in seen:
-                seen.add(url)
-                unique_urls.append(url)
-
-        # Limpa timestamps órfãos
-        url_set = set(unique_urls)
-        cleaned_timestamps = {u: t for u, t in url_timestamps.items() if u in url_set}
-
-        removed = original_count - len(unique_urls)
-
-        state['processed_urls'] = unique_urls
-        state['url_timestamps'] = cleaned_timestamps
+        # Mantém hashes recentes ou sem timestamp (conservador). dict() sobre os pares
+        # deduplica em C preservando a ordem; como o arquivo é append-only, o último
+        # registro de cada digest é o mais recente
+        kept = dict(r for r in records if r[1] == 0 or r[1] >= cutoff_ts)
+
+        removed = original_count - len(kept)
+        write_hash_records(hashes_file, kept.items())
+
+        state['processed_count'] = len(kept)
+        state['hashes_file'] = hashes_file.name
         state['last_optimized'] = datetime.now().isoformat()
         state['optimization_info'] = f"Removed {removed} entries (duplicates or older than 30 days)"
 
-        with open(state_file, 'w', encoding='utf-8') as f:
-            json.dump(state, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            state_file.write_bytes(orjson.dumps(state))
+        else:
+            with open(state_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, separators=(',', ':'))
 
-        new_size = state_file.stat().st_size
+        new_size = state_file.stat().st_size + hashes_file.stat().st_size
         savings = original_size - new_size
 
         print(f"✅ Otimização concluída:")
         print(f"   URLs originais: {original_count}")
-        print(f"   URLs após limpeza: {len(unique_urls)}")
+        print(f"   URLs após limpeza: {len(kept)}")
         print(f"   Entradas removidas: {removed}")
         print(f"   Economia de espaço: {savings} bytes")
         return True
@@ -122,6 +138,23 @@ def optimize_state_file():
         print(f"  ❌ Erro na otimização: {e}")
         return False
 
+# JSON já validado: caminho → (st_mtime_ns, st_size, conteúdo)
+_CONFIG_CACHE = {}
+
+def _cached_load(path):
+    """Decodifica um JSON, reaproveitando o resultado enquanto mtime e tamanho não mudarem"""
+    import json
+    path = str(path)
+    st = os.stat(path)
+    cached = _CONFIG_CACHE.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]  # inalterado: só o stat
+    with open(path, 'rb') as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    _CONFIG_CACHE[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
 def check_system_integrity():
     """Verifica integridade do sistema"""
     print("🔍 Verificando integridade do sistema...")
@@ -153,11 +186,8 @@ def check_system_integrity():
 
     # Verifica configurações JSON
     try:
-        import json
-        with open(_ROOT / 'config/sources.json', 'r') as f:
-            json.load(f)
-        with open(_ROOT / 'config/settings.json', 'r') as f:
-            json.load(f)
+        _cached_load(_ROOT / 'config/sources.json')
+        _cached_load(_ROOT / 'config/settings.json')
         print("  ✅ Arquivos de configuração válidos")
     except Exception as e:
         issues.append(f"Erro na configuração: {e}")
@@ -171,6 +201,22 @@ def check_system_integrity():
         print("✅ Sistema íntegro")
         return True
 
+def _walk_backup_dir(src_path):
+    """Gera (origem, nome no zip) dos arquivos de um diretório, ignorando __pycache__"""
+    base = str(src_path.parent)
+    for root, dirs, files in os.walk(src_path):
+        dirs[:] = [d for d in dirs if d not in _TEMP_DIRS]
+        for name in files:
+            full = os.path.join(root, name)
+            yield full, os.path.relpath(full, base)
+
+def _read_backup_entry(path: str, arcname: str):
+    """Lê um arquivo para o backup, preservando data e permissões no ZipInfo"""
+    info = zipfile.ZipInfo.from_file(path, arcname)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    with open(path, 'rb') as f:
+        return info, f.read()
+
 def backup_important_files():
     """Faz backup de arquivos importantes"""
     print("💾 Criando backup de arquivos importantes...")
@@ -180,50 +226,68 @@ def backup_important_files():
 
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     backup_name = f'backup_{timestamp}'
-    backup_path = backup_dir / backup_name
-    backup_path.mkdir()
+    backup_zip = backup_dir / f'{backup_name}.zip'
+    tmp_zip = backup_dir / f'.{backup_name}.zip.tmp'
 
     important_files = [
         _ROOT / 'news_state.json',
+        _ROOT / 'news_state.bin',
         _ROOT / 'briefing.log',
         _ROOT / 'config',
         _ROOT / 'src',
     ]
 
-    backed_up = 0
+    # Lista (origem, nome no zip) de cada arquivo, agrupados pelo item de important_files
+    entries = {}
     for file_path in important_files:
         src_path = Path(file_path)
-        if src_path.exists():
-            dst_path = backup_path / src_path.name
-            try:
-                if src_path.is_file():
-                    shutil.copy2(src_path, dst_path)
-                else:
-                    shutil.copytree(src_path, dst_path, dirs_exist_ok=True)
-                backed_up += 1
-                print(f"  📁 Backed up: {file_path}")
-            except Exception as e:
-                print(f"  ❌ Error backing up {file_path}: {e}")
-
-    # Compacta o backup
+        if not src_path.exists():
+            continue
+        if src_path.is_file():
+            entries[file_path] = [(str(src_path), src_path.name)]
+        else:
+            entries[file_path] = list(_walk_backup_dir(src_path))
+
+    # Leituras em paralelo (I/O libera o GIL); o zip é escrito em ordem na thread principal.
+    # Sem diretório intermediário; nível 1 prioriza velocidade. Grava em temporário e
+    # renomeia: uma falha nunca deixa um backup truncado
+    backed_up = 0
+    msgs = []
     try:
-        shutil.make_archive(str(backup_path), 'zip', str(backup_path))
-        shutil.rmtree(backup_path)  # Remove diretório após compactar
-        print(f"✅ Backup criado: {backup_name}.zip")
+        with zipfile.ZipFile(tmp_zip, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf, \
+                ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 1) * 2)) as executor:
+            for file_path, items in entries.items():
+                futures = [executor.submit(_read_backup_entry, path, arcname) for path, arcname in items]
+                try:
+                    for future in futures:
+                        info, data = future.result()
+                        zf.writestr(info, data, compresslevel=1)
+                    backed_up += 1
+                    msgs.append(f"  📁 Backed up: {file_path}")
+                except Exception as e:
+                    msgs.append(f"  ❌ Error backing up {file_path}: {e}")
+        os.replace(tmp_zip, backup_zip)
+        msgs.append(f"✅ Backup criado: {backup_zip.name}")
     except Exception as e:
-        print(f"❌ Erro ao compactar backup: {e}")
+        msgs.append(f"❌ Erro ao compactar backup: {e}")
+        tmp_zip.unlink(missing_ok=True)
 
     # Limpa backups antigos (mantém apenas os 5 mais recentes)
     try:
-        backup_files = list(backup_dir.glob('backup_*.zip'))
-        backup_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-
-        if len(backup_files) > 5:
-            for old_backup in backup_files[5:]:
-                old_backup.unlink()
-                print(f"🗑️ Removed old backup: {old_backup.name}")
+        # Um scandir lista os backups junto com o stat; só os excedentes são ordenados
+        with os.scandir(backup_dir) as it:
+            backup_files = [
+                (entry.stat().st_mtime, entry.name, entry.path)
+                for entry in it
+                if entry.name.startswith('backup_') and entry.name.endswith('.zip')
+            ]
+
+        for _, name, path in heapq.nsmallest(max(0, len(backup_files) - 5), backup_files):
+            os.unlink(path)
+            msgs.append(f"🗑️ Removed old backup: {name}")
     except Exception as e:
-        print(f"❌ Error cleaning old backups: {e}")
+        msgs.append(f"❌ Error cleaning old backups: {e}")
+    _write_lines(msgs)
 
     return backed_up
 
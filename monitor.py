@@ -7,15 +7,58 @@ Dashboard para acompanhar performance e status do sistema
 import os
 import json
 import sys
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime, timedelta
-import subprocess
+from importlib.util import find_spec
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _read_json(path):
+    """Lê e decodifica um arquivo JSON (orjson quando disponível)"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+# Marca "estado ainda não carregado" (None significa estado ausente/inválido)
+_UNSET = object()
+
+_ERROR_MARK = '❌'.encode('utf-8')
+
+def _tail_lines(path, count: int, block_size: int = 4096) -> list:
+    """Lê as últimas linhas (bytes) a partir do fim do arquivo, sem carregá-lo inteiro"""
+    with open(path, 'rb') as f:
+        pos = os.fstat(f.fileno()).st_size
+        data = b''
+        # Volta em blocos até ter uma quebra a mais que o necessário (linha parcial no início)
+        while pos > 0 and data.count(b'\n') <= count:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    return data.splitlines()[-count:]
+
+def _processed_count(state: dict) -> int:
+    """Número de URLs processadas (formato com hashes ou lista antiga de URLs)"""
+    if 'processed_count' in state:
+        return state['processed_count']
+    return len(state.get('processed_urls', []))
 
 class SystemMonitor:
     """Monitor completo do sistema de briefing"""
 
     def __init__(self):
         self.project_root = Path(__file__).parent
+        # Caminhos usados a cada dashboard, resolvidos uma única vez como str
+        self._root = str(self.project_root)
+        self._state_path = os.path.join(self._root, 'news_state.json')
+        self._sources_path = os.path.join(self._root, 'config', 'sources.json')
+        self._settings_path = os.path.join(self._root, 'config', 'settings.json')
+        self._log_path = os.path.join(self._root, 'briefing.log')
+        self._state_cache = _UNSET
 
     def get_system_status(self):
         """Obtém status completo do sistema"""
@@ -27,6 +70,9 @@ class SystemMonitor:
             'alerts': []
         }
 
+        # Estado lido uma única vez por chamada e compartilhado pelas verificações
+        self._state_cache = self._safe_load_state()
+
         # Status dos componentes
         status['components'] = self._check_components()
 
@@ -41,6 +87,37 @@ class SystemMonitor:
 
         return status
 
+    def _safe_load_state(self):
+        """Lê news_state.json; None se ausente ou inválido"""
+        try:
+            return _read_json(self._state_path)
+        except Exception:
+            return None
+
+    def _state(self):
+        """Estado da chamada atual (carregado sob demanda se o helper for usado isoladamente)"""
+        if self._state_cache is _UNSET:
+            self._state_cache = self._safe_load_state()
+        return self._state_cache
+
+    def _existing_names(self, paths):
+        """Retorna quais caminhos (relativos à raiz) existem, com um scandir por diretório"""
+        by_dir = defaultdict(set)
+        for rel_path in paths:
+            parent, _, name = rel_path.rpartition('/')
+            by_dir[parent].add(name)
+
+        existing = set()
+        for parent, names in by_dir.items():
+            directory = os.path.join(self._root, parent) if parent else self._root
+            try:
+                with os.scandir(directory) as it:
+                    existing.update(f"{parent}/{e.name}" if parent else e.name
+                                    for e in it if e.name in names)
+            except (FileNotFoundError, NotADirectoryError):
+                pass
+        return existing
+
     def _check_components(self):
         """Verifica status dos componentes principais"""
         components = {}
@@ -53,21 +130,23 @@ class SystemMonitor:
             '.github/workflows/daily-briefing.yml'
         ]
 
+        # Um scandir por diretório (a raiz também responde pelo venv)
+        existing = self._existing_names(essential_files + ['venv'])
+
         components['files'] = {}
         for file_path in essential_files:
-            exists = (self.project_root / file_path).exists()
-            components['files'][file_path] = '✅' if exists else '❌'
+            components['files'][file_path] = '✅' if file_path in existing else '❌'
 
         # Dependências
+        # find_spec só localiza o módulo: sem subprocess e sem executar o import
         try:
-            result = subprocess.run([sys.executable, '-c', 'import requests, feedparser, telegram'],
-                                  capture_output=True, text=True, timeout=10)
-            components['dependencies'] = '✅ OK' if result.returncode == 0 else '❌ Missing'
+            missing = [m for m in ('requests', 'feedparser', 'telegram') if find_spec(m) is None]
+            components['dependencies'] = '✅ OK' if not missing else f"❌ Missing: {', '.join(missing)}"
         except:
             components['dependencies'] = '❌ Error'
 
         # Virtual environment
-        venv_exists = (self.project_root / 'venv').exists()
+        venv_exists = 'venv' in existing
         components['venv'] = '✅ Active' if venv_exists else '❌ Missing'
 
         return components
@@ -75,27 +154,24 @@ class SystemMonitor:
     def _check_performance(self):
         """Verifica métricas de performance"""
         performance = {}
+        state = self._state()
 
         # Estado de processamento
         try:
-            with open(self.project_root / 'news_state.json', 'r') as f:
-                state = json.load(f)
-                performance['processed_urls'] = len(state.get('processed_urls', []))
-                performance['last_updated'] = state.get('last_updated', 'Never')
+            performance['processed_urls'] = _processed_count(state)
+            performance['last_updated'] = state.get('last_updated', 'Never')
         except:
             performance['processed_urls'] = 0
             performance['last_updated'] = 'Error'
 
         # Logs recentes
-        log_file = self.project_root / 'briefing.log'
-        if log_file.exists():
+        if os.path.exists(self._log_path):
             try:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()[-10:]  # Últimas 10 linhas
-                    performance['recent_logs'] = len(lines)
-                    # Verificar se há erros recentes
-                    errors = [line for line in lines if 'ERROR' in line or '❌' in line]
-                    performance['recent_errors'] = len(errors)
+                lines = _tail_lines(self._log_path, 10)  # Últimas 10 linhas
+                performance['recent_logs'] = len(lines)
+                # Verificar se há erros recentes (direto nos bytes, sem decodificar)
+                errors = [line for line in lines if b'ERROR' in line or _ERROR_MARK in line]
+                performance['recent_errors'] = len(errors)
             except:
                 performance['recent_logs'] = 'Error reading'
                 performance['recent_errors'] = 'Unknown'
@@ -107,8 +183,7 @@ class SystemMonitor:
         sources = {}
 
         try:
-            with open(self.project_root / 'config/sources.json', 'r') as f:
-                config = json.load(f)
+            config = _read_json(self._sources_path)
 
             # RSS feeds
             rss_feeds = config['sources']['rss_feeds']
@@ -132,28 +207,25 @@ class SystemMonitor:
     def _check_alerts(self):
         """Verifica alertas e problemas do sistema"""
         alerts = []
+        state = self._state()
 
         # Verificar se estado está sendo atualizado
         try:
-            with open(self.project_root / 'news_state.json', 'r') as f:
-                state = json.load(f)
-                last_update = state.get('last_updated')
-                if last_update:
-                    last_update_dt = datetime.fromisoformat(last_update)
-                    hours_since_update = (datetime.now() - last_update_dt).total_seconds() / 3600
-
-                    if hours_since_update > 25:  # Mais de 25 horas sem atualização
-                        alerts.append(f"⚠️ Sistema não executou há {hours_since_update:.1f} horas")
+            last_update = state.get('last_updated')
+            if last_update:
+                last_update_dt = datetime.fromisoformat(last_update)
+                hours_since_update = (datetime.now() - last_update_dt).total_seconds() / 3600
+
+                if hours_since_update > 25:  # Mais de 25 horas sem atualização
+                    alerts.append(f"⚠️ Sistema não executou há {hours_since_update:.1f} horas")
         except:
             alerts.append("❌ Erro ao ler arquivo de estado")
 
         # Verificar tamanho do estado (muitas URLs acumuladas)
         try:
-            with open(self.project_root / 'news_state.json', 'r') as f:
-                state = json.load(f)
-                url_count = len(state.get('processed_urls', []))
-                if url_count > 1000:  # Muitas URLs armazenadas
-                    alerts.append(f"⚠️ Arquivo de estado grande: {url_count} URLs processadas")
+            url_count = _processed_count(state)
+            if url_count > 1000:  # Muitas URLs armazenadas
+                alerts.append(f"⚠️ Arquivo de estado grande: {url_count} URLs processadas")
         except:
             pass
 
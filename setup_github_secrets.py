@@ -7,6 +7,18 @@ Executar uma vez para configurar o repositório
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+def _run_parallel(commands):
+    """Executa comandos independentes em paralelo; retorna resultado ou exceção de cada um"""
+    def run(cmd):
+        try:
+            return subprocess.run(cmd, capture_output=True, text=True)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+        return list(executor.map(run, commands))
 
 def setup_github_secrets():
     """Configura os secrets necessários no GitHub"""
@@ -14,41 +26,39 @@ def setup_github_secrets():
     print("🔐 Configuração de Secrets do GitHub Actions")
     print("=" * 50)
 
+    # As três verificações são independentes: dispara todas em paralelo
+    git_result, gh_result, auth_result = _run_parallel([
+        ['git', 'remote', 'get-url', 'origin'],
+        ['gh', '--version'],
+        ['gh', 'auth', 'status'],
+    ])
+
     # Verificar se estamos em um repositório git
-    try:
-        result = subprocess.run(['git', 'remote', 'get-url', 'origin'],
-                              capture_output=True, text=True, check=True)
-        repo_url = result.stdout.strip()
-        print(f"📂 Repositório: {repo_url}")
-    except subprocess.CalledProcessError:
+    if isinstance(git_result, Exception) or git_result.returncode != 0:
         print("❌ Erro: Não estamos em um repositório Git válido")
         return False
+    repo_url = git_result.stdout.strip()
+    print(f"📂 Repositório: {repo_url}")
 
     # Verificar se gh CLI está instalado
-    try:
-        result = subprocess.run(['gh', '--version'],
-                              capture_output=True, text=True, check=True)
-        print("✅ GitHub CLI encontrado")
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    if isinstance(gh_result, Exception) or gh_result.returncode != 0:
         print("❌ GitHub CLI não encontrado")
         print("💡 Instale o GitHub CLI: https://cli.github.com/")
         print("   brew install gh  # macOS")
         print("   Ou baixe de: https://github.com/cli/cli/releases")
         return False
+    print("✅ GitHub CLI encontrado")
 
     # Verificar se usuário está logado no GitHub
-    try:
-        result = subprocess.run(['gh', 'auth', 'status'],
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ Autenticado no GitHub")
-        else:
-            print("❌ Não autenticado no GitHub")
-            print("💡 Execute: gh auth login")
-            return False
-    except subprocess.CalledProcessError:
+    if isinstance(auth_result, Exception):
         print("❌ Erro ao verificar autenticação")
         return False
+    if auth_result.returncode == 0:
+        print("✅ Autenticado no GitHub")
+    else:
+        print("❌ Não autenticado no GitHub")
+        print("💡 Execute: gh auth login")
+        return False
 
     # Configurar secrets
     # Ler de env ou solicitar ao usuário (nunca versionar tokens reais)
@@ -72,9 +82,9 @@ def setup_github_secrets():
         try:
             print(f"  📝 Configurando {secret_name}...")
 
-            # Usar echo para passar o valor para gh secret set
-            cmd = f'echo -n "{secret_info["value"]}" | gh secret set {secret_name}'
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+            # Valor vai pelo stdin do gh: sem shell, sem problemas de quoting
+            result = subprocess.run(['gh', 'secret', 'set', secret_name],
+                                  input=secret_info['value'], capture_output=True, text=True)
 
             if result.returncode == 0:
                 print(f"    ✅ {secret_name} configurado")
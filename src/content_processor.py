@@ -3,24 +3,101 @@ Content Processor Module
 Processa e filtra conteúdo coletado, gerencia estado de notícias enviadas
 """
 
+import os
 import json
+import time
+import struct
+import heapq
+import hashlib
 import logging
+from operator import attrgetter
 from datetime import datetime
-from typing import List, Dict, Set
+from typing import List, Dict, Iterable, Tuple
 from pathlib import Path
 
 from news_collector import NewsItem
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+_relevance = attrgetter('relevance_score')
+
+# Registro do arquivo de hashes: digest blake2b de 64 bits + timestamp unix (0 = desconhecido)
+HASH_RECORD = struct.Struct('<Qq')
+
+def url_digest(url: str) -> int:
+    """Digest estável de 64 bits da URL (colisão ~3e-8 com 10⁶ URLs)"""
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def hashes_path(state_file) -> Path:
+    """Arquivo binário de hashes associado ao arquivo de estado"""
+    return Path(state_file).with_suffix('.bin')
+
+def read_hash_records(path) -> List[Tuple[int, int]]:
+    """Lê registros (digest, timestamp) do arquivo de hashes; ignora registro final truncado"""
+    try:
+        data = Path(path).read_bytes()
+    except FileNotFoundError:
+        return []
+    usable = len(data) - len(data) % HASH_RECORD.size
+    return list(HASH_RECORD.iter_unpack(memoryview(data)[:usable]))
+
+def append_hash_records(path, records: Iterable[Tuple[int, int]]):
+    """Acrescenta registros ao fim do arquivo de hashes (uma única escrita)"""
+    with open(path, 'ab') as f:
+        f.write(b''.join(HASH_RECORD.pack(d, ts) for d, ts in records))
+
+def write_hash_records(path, records: Iterable[Tuple[int, int]]):
+    """Regrava o arquivo de hashes de forma atômica"""
+    path = Path(path)
+    tmp_file = path.with_name(f".{path.name}.tmp")
+    tmp_file.write_bytes(b''.join(HASH_RECORD.pack(d, ts) for d, ts in records))
+    os.replace(tmp_file, path)
+
+def legacy_hash_records(state: dict) -> List[Tuple[int, int]]:
+    """Converte o formato antigo (URLs completas + url_timestamps ISO) em registros"""
+    url_timestamps = state.get('url_timestamps', {})
+    records = []
+    for url in state.get('processed_urls', []):
+        ts = url_timestamps.get(url)
+        try:
+            unix_ts = int(datetime.fromisoformat(ts).timestamp()) if ts else 0
+        except ValueError:
+            unix_ts = 0  # data inválida → desconhecida
+        records.append((url_digest(url), unix_ts))
+    return records
+
 class ContentProcessor:
     """Processador de conteúdo que filtra duplicatas e gerencia estado"""
 
     def __init__(self, state_file: str = 'news_state.json'):
         self.state_file = Path(state_file)
-        self.processed_urls: Set[str] = set()
+        self.hashes_file = hashes_path(self.state_file)
+        # digest da URL → timestamp unix do envio
+        self.processed_urls: Dict[int, int] = {}
+        # Registros ainda não gravados; o arquivo de hashes é append-only
+        self._pending: List[Tuple[int, int]] = []
+        self._needs_rewrite = False
+        # Só grava quando há algo novo; o primeiro save da instância sempre
+        # acontece (atualiza last_updated). Dentro de `with`, grava uma vez no fim
+        self._dirty = False
+        self._saved = False
+        self._deferred = False
         self._load_processed_urls()
 
+    def __enter__(self):
+        self._deferred = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._deferred = False
+        self._save_processed_urls()
+        return False
+
     def process(self, news_items: List[NewsItem]) -> List[NewsItem]:
         """Processa lista de notícias: remove duplicatas, filtra já enviadas, prioriza"""
         logger.info(f"🎯 Processing {len(news_items)} news items")
@@ -33,12 +110,9 @@ class ContentProcessor:
         new_items = self._filter_already_processed(unique_items)
         logger.info(f"🔄 Filtered already processed: {len(new_items)} new items")
 
-        # Prioriza por relevância (keywords)
-        prioritized = self._prioritize_by_keywords(new_items)
+        # Prioriza por relevância (keywords) e limita quantidade por execução (máximo 10)
+        final_items = self._prioritize_by_keywords(new_items, limit=10)
         logger.info(f"⭐ Prioritized by relevance")
-
-        # Limita quantidade por execução (máximo 10)
-        final_items = prioritized[:10]
         logger.info(f"📏 Limited to {len(final_items)} items")
 
         # Atualiza estado dos itens processados
@@ -48,68 +122,99 @@ class ContentProcessor:
 
     def _remove_duplicates(self, news_items: List[NewsItem]) -> List[NewsItem]:
         """Remove duplicatas baseadas em URL"""
-        seen_urls = set()
-        unique_items = []
-
+        # Dict preserva a ordem de inserção; setdefault mantém a primeira ocorrência
+        unique: Dict[str, NewsItem] = {}
         for item in news_items:
-            if item.url not in seen_urls:
-                seen_urls.add(item.url)
-                unique_items.append(item)
-
-        return unique_items
+            unique.setdefault(item.url, item)
+        return list(unique.values())
 
     def _filter_already_processed(self, news_items: List[NewsItem]) -> List[NewsItem]:
         """Filtra itens que já foram processados anteriormente"""
-        new_items = []
-
-        for item in news_items:
-            if item.url not in self.processed_urls:
-                new_items.append(item)
-
-        return new_items
+        processed = self.processed_urls
+        return [item for item in news_items if url_digest(item.url) not in processed]
 
-    def _prioritize_by_keywords(self, news_items: List[NewsItem]) -> List[NewsItem]:
+    def _prioritize_by_keywords(self, news_items: List[NewsItem], limit: int = None) -> List[NewsItem]:
         """Prioriza notícias baseado em keywords de relevância"""
-        # Já calculado no NewsCollector, apenas reordena
-        return sorted(news_items, key=lambda x: x.relevance_score, reverse=True)
+        # Já calculado no NewsCollector, apenas reordena. Com limite, nlargest é
+        # O(N log k) e equivale a sorted(...)[:k] (empates mantêm a ordem de entrada)
+        if limit is not None:
+            return heapq.nlargest(limit, news_items, key=_relevance)
+        news_items.sort(key=_relevance, reverse=True)
+        return news_items
 
     def _update_processed_state(self, processed_items: List[NewsItem]):
         """Atualiza estado dos itens processados"""
-        now = datetime.now().isoformat()
+        now = int(time.time())
         for item in processed_items:
-            self.processed_urls.add(item.url)
-            self.url_timestamps[item.url] = now
+            digest = url_digest(item.url)
+            self.processed_urls[digest] = now
+            self._pending.append((digest, now))
 
-        self._save_processed_urls()
+        if processed_items or not self._saved:
+            self._dirty = True
+        if not self._deferred:
+            self._save_processed_urls()
 
     def _load_processed_urls(self):
         """Carrega URLs processadas do arquivo de estado"""
-        self.url_timestamps: Dict[str, str] = {}
+        # Sem estado válido o arquivo de hashes é regravado do zero no próximo save
+        self._needs_rewrite = True
         try:
             if self.state_file.exists():
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.processed_urls = set(data.get('processed_urls', []))
-                    self.url_timestamps = data.get('url_timestamps', {})
-                    logger.info(f"📁 Loaded {len(self.processed_urls)} processed URLs")
+                raw = self.state_file.read_bytes()
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                if 'processed_urls' in data:
+                    # Formato antigo: migra para hashes (gravados no próximo save)
+                    records = legacy_hash_records(data)
+                else:
+                    if 'hashes_file' in data and not self.hashes_file.exists():
+                        logger.warning(f"⚠️ Hashes file {self.hashes_file} missing; processed URLs will be re-sent")
+                    records = read_hash_records(self.hashes_file)
+                    # Só acrescenta em arquivo alinhado e sem duplicatas acumuladas
+                    size = self.hashes_file.stat().st_size if self.hashes_file.exists() else 0
+                    self._needs_rewrite = size != len(records) * HASH_RECORD.size
+                self.processed_urls = dict(records)
+                if len(self.processed_urls) != len(records):
+                    self._needs_rewrite = True
+                logger.info(f"📁 Loaded {len(self.processed_urls)} processed URLs")
             else:
                 logger.info("📁 No previous state file found, starting fresh")
         except Exception as e:
             logger.warning(f"⚠️ Failed to load state file: {e}")
-            self.processed_urls = set()
+            self.processed_urls = {}
+
+    def compact(self):
+        """Regrava o arquivo de hashes a partir do estado em memória"""
+        write_hash_records(self.hashes_file, self.processed_urls.items())
+        self._pending = []
+        self._needs_rewrite = False
 
     def _save_processed_urls(self):
         """Salva URLs processadas no arquivo de estado"""
+        if not self._dirty:
+            return
         try:
+            # Custo O(k) por execução: só os novos registros vão para o disco
+            if self._needs_rewrite:
+                self.compact()
+            elif self._pending:
+                append_hash_records(self.hashes_file, self._pending)
+                self._pending = []
+
             data = {
-                'processed_urls': list(self.processed_urls),
-                'url_timestamps': self.url_timestamps,
+                'processed_count': len(self.processed_urls),
+                'hashes_file': self.hashes_file.name,
                 'last_updated': datetime.now().isoformat()
             }
 
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                self.state_file.write_bytes(orjson.dumps(data))
+            else:
+                with open(self.state_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
 
+            self._dirty = False
+            self._saved = True
             logger.info(f"💾 Saved {len(self.processed_urls)} processed URLs")
         except Exception as e:
             logger.error(f"❌ Failed to save state file: {e}")
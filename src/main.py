@@ -10,16 +10,32 @@ import json
 import logging
 import sys
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 _ROOT = Path(__file__).parent.parent
 
-# Configure logging
+# Import log rotation
+try:
+    from log_rotate import check_and_rotate_logs, create_log_handler
+    LOG_ROTATION_ENABLED = True
+except ImportError:
+    LOG_ROTATION_ENABLED = False
+    def check_and_rotate_logs():
+        return False
+
+# Configure logging (com rotação .gz no próprio handler, quando disponível)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler(_ROOT / 'briefing.log'),
+        create_log_handler(_ROOT / 'briefing.log') if LOG_ROTATION_ENABLED
+        else logging.FileHandler(_ROOT / 'briefing.log'),
         logging.StreamHandler()
     ]
 )
@@ -40,30 +56,40 @@ except ImportError:
     def send_alert(*args, **kwargs):
         pass
 
-# Import log rotation
-try:
-    from log_rotate import check_and_rotate_logs
-    LOG_ROTATION_ENABLED = True
-except ImportError:
-    LOG_ROTATION_ENABLED = False
-    def check_and_rotate_logs():
-        return False
+# Sanitização/validação dos secrets do Telegram (compiladas uma vez)
+_TOKEN_STRIP_RE = re.compile(r'[^\w:-]')  # \w: alfanuméricos + '_'
+_CHAT_STRIP_RE = re.compile(r'[^\d-]')
+_TOKEN_RE = re.compile(r'^\d{5,}:[A-Za-z0-9_-]{30,}$')
+_CHAT_RE = re.compile(r'^-?\d{5,}$')
+
+# Configuração já carregada: (stat de settings.json, stat de sources.json) → dict mesclado
+_CONFIG_CACHE = {}
 
 def load_config() -> dict:
     """Load configuration from JSON files"""
     config_dir = _ROOT / 'config'
+    settings_path = config_dir / 'settings.json'
+    sources_path = config_dir / 'sources.json'
+
+    # Reaproveita o resultado enquanto mtime e tamanho dos dois arquivos não mudarem
+    key = tuple((st.st_mtime_ns, st.st_size) for st in map(os.stat, (settings_path, sources_path)))
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    loads = orjson.loads if orjson is not None else json.loads
 
     # Load settings
-    with open(config_dir / 'settings.json', 'r', encoding='utf-8') as f:
-        settings = json.load(f)
+    settings = loads(settings_path.read_bytes())
 
     # Load sources
-    with open(config_dir / 'sources.json', 'r', encoding='utf-8') as f:
-        sources = json.load(f)
+    sources = loads(sources_path.read_bytes())
 
     # Merge configurations
     config = {**settings, **sources}
-    return config
+    _CONFIG_CACHE.clear()
+    _CONFIG_CACHE[key] = config
+    return dict(config)
 
 def main():
     """Main pipeline execution"""
@@ -106,12 +132,12 @@ def main():
         raw_chat = os.getenv('TELEGRAM_CHAT_ID', '')
 
         # Remove all whitespace and keep only allowed chars
-        telegram_token = ''.join(ch for ch in raw_token if ch.isalnum() or ch in [':', '-', '_'])
-        telegram_chat_id = ''.join(ch for ch in raw_chat if ch.isdigit() or ch == '-')
+        telegram_token = _TOKEN_STRIP_RE.sub('', raw_token)
+        telegram_chat_id = _CHAT_STRIP_RE.sub('', raw_chat)
 
         # Basic diagnostics (length/format only; no secrets)
-        token_ok = re.match(r'^\d{5,}:[A-Za-z0-9_-]{30,}$', telegram_token) is not None
-        chat_ok = re.match(r'^-?\d{5,}$', telegram_chat_id) is not None
+        token_ok = _TOKEN_RE.match(telegram_token) is not None
+        chat_ok = _CHAT_RE.match(telegram_chat_id) is not None
         logger.info(f"🔐 Token len={len(telegram_token)} ok={token_ok} | Chat len={len(telegram_chat_id)} ok={chat_ok}")
 
         if not telegram_token or not telegram_chat_id or not token_ok or not chat_ok:
@@ -128,17 +154,20 @@ def main():
 
         # Execute pipeline
         logger.info("🔍 Phase 1: Collecting news...")
-        raw_news = collector.collect_all()
+        with collector:
+            raw_news = collector.collect_all()
 
         logger.info("🎯 Phase 2: Processing content...")
         processed_news = processor.process(raw_news)
 
+        # Formatação e envio em streaming: cada mensagem é enviada assim que fica pronta
         logger.info("📝 Phase 3: Formatting messages...")
-        messages = formatter.format_messages(processed_news)
+        messages = formatter.iter_messages(processed_news)
+        first_message = next(messages, None)
 
-        if messages:
-            logger.info(f"📤 Phase 4: Sending {len(messages)} message(s)...")
-            success = sender.send_messages(messages)
+        if first_message is not None:
+            logger.info("📤 Phase 4: Sending messages...")
+            success = sender.send_messages(chain([first_message], messages))
 
             if success:
                 logger.info("✅ All messages sent successfully!")
@@ -4,13 +4,45 @@ Formata notícias em mensagens compatíveis com Telegram
 """
 
 import logging
-from typing import List
-from textwrap import shorten
+from string import Formatter
+from typing import Callable, Iterator, List
 
 from news_collector import NewsItem
 
 logger = logging.getLogger(__name__)
 
+_TEMPLATE_FIELDS = frozenset(['title', 'summary', 'url'])
+
+def _compile_template(template: str) -> Callable[[str, str, str], str]:
+    """Compila o template num f-string (lambda title, summary, url); senão usa str.format"""
+    def fallback(title, summary, url):
+        return template.format(title=title, summary=summary, url=url)
+
+    try:
+        parts = list(Formatter().parse(template))
+    except ValueError:
+        return fallback
+
+    # Só campos simples conhecidos, sem conversão nem format spec: nada além deles vira código
+    source = []
+    for literal, field, spec, conversion in parts:
+        source.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field is None:
+            continue
+        if field not in _TEMPLATE_FIELDS or spec or conversion:
+            return fallback
+        source.append('{' + field + '}')
+
+    return eval('lambda title, summary, url: f' + repr(''.join(source)), {'__builtins__': {}})
+
+def _truncate(text: str, width: int, placeholder: str = "...") -> str:
+    """Corta o texto (já com espaços simples) na última palavra inteira que cabe, junto com o placeholder"""
+    if len(text) <= width:
+        return text
+    # Um caractere a mais: se ele for espaço, a última palavra cabe inteira
+    head = text[:width - len(placeholder) + 1]
+    return (head.rsplit(' ', 1)[0] if ' ' in head else '') + placeholder
+
 class MessageFormatter:
     """Formatador de mensagens para Telegram"""
 
@@ -19,36 +51,47 @@ class MessageFormatter:
         self.summary_max_length = formatting_config.get('summary_max_length', 150)
         self.template = formatting_config.get('format_template',
             "📰 {title}\n📝 {summary}\n🔗 {url}\n\n")
+        self._render = _compile_template(self.template)
 
     def format_messages(self, news_items: List[NewsItem]) -> List[str]:
         """Formata lista de notícias em mensagens Telegram"""
+        return list(self.iter_messages(news_items))
+
+    def iter_messages(self, news_items: List[NewsItem]) -> Iterator[str]:
+        """Gera as mensagens Telegram à medida que ficam completas (o envio pode começar antes do fim)"""
         if not news_items:
-            return []
+            return
 
-        messages = []
-        current_message = ""
+        count = 0
+        # Partes da mensagem atual e seu tamanho total (evita concatenar a cada item)
+        current_parts = []
+        current_length = 0
 
         logger.info(f"📝 Formatting {len(news_items)} news items into messages")
 
         for item in news_items:
             formatted_item = self._format_single_item(item)
+            item_length = len(formatted_item)
 
             # Verifica se cabe na mensagem atual
-            if len(current_message + formatted_item) > self.max_length:
-                if current_message:
-                    messages.append(current_message.strip())
-                    logger.debug(f"📦 Created message with {len(current_message)} chars")
-                current_message = formatted_item
+            if current_length + item_length > self.max_length:
+                if current_parts:
+                    logger.debug(f"📦 Created message with {current_length} chars")
+                    count += 1
+                    yield ''.join(current_parts).strip()
+                current_parts = [formatted_item]
+                current_length = item_length
             else:
-                current_message += formatted_item
+                current_parts.append(formatted_item)
+                current_length += item_length
 
         # Adiciona última mensagem se existir
-        if current_message:
-            messages.append(current_message.strip())
-            logger.debug(f"📦 Created final message with {len(current_message)} chars")
+        if current_parts:
+            logger.debug(f"📦 Created final message with {current_length} chars")
+            count += 1
+            yield ''.join(current_parts).strip()
 
-        logger.info(f"📨 Generated {len(messages)} message(s) for Telegram")
-        return messages
+        logger.info(f"📨 Generated {count} message(s) for Telegram")
 
     def _format_single_item(self, item: NewsItem) -> str:
         """Formata um único item de notícia"""
@@ -58,17 +101,13 @@ class MessageFormatter:
 
             # Limpa e limita o resumo
             summary = self._clean_text(item.summary)
-            summary = shorten(summary, width=self.summary_max_length, placeholder="...")
+            summary = _truncate(summary, self.summary_max_length)
 
             # Limpa a URL
             url = item.url.strip()
 
             # Aplica template
-            formatted = self.template.format(
-                title=title,
-                summary=summary,
-                url=url
-            )
+            formatted = self._render(title, summary, url)
 
             return formatted
 
@@ -82,29 +121,26 @@ class MessageFormatter:
         if not text:
             return ""
 
-        # Remove caracteres problemáticos
-        text = text.replace('<', '&lt;').replace('>', '&gt;')
-
-        # Remove quebras de linha excessivas
-        import re
-        text = re.sub(r'\n\s*\n', '\n', text)
-
-        # Limpa espaços extras
-        text = ' '.join(text.split())
+        # Escapa caracteres especiais do parse_mode HTML ('&' primeiro)
+        text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
 
-        return text.strip()
+        # Colapsa qualquer sequência de espaços/quebras de linha num único espaço
+        # (split() já descarta as pontas, então não precisa de strip())
+        return ' '.join(text.split())
 
     def get_message_stats(self, messages: List[str]) -> dict:
         """Retorna estatísticas das mensagens"""
         if not messages:
             return {'count': 0, 'total_chars': 0, 'avg_chars': 0}
 
-        total_chars = sum(len(msg) for msg in messages)
+        # Tamanhos calculados uma única vez; sum/max/min rodam em C sobre a lista
+        lengths = list(map(len, messages))
+        total_chars = sum(lengths)
 
         return {
-            'count': len(messages),
+            'count': len(lengths),
             'total_chars': total_chars,
-            'avg_chars': total_chars // len(messages),
-            'max_chars': max(len(msg) for msg in messages),
-            'min_chars': min(len(msg) for msg in messages)
+            'avg_chars': total_chars // len(lengths),
+            'max_chars': max(lengths),
+            'min_chars': min(lengths)
         }
@@ -3,18 +3,296 @@ News Collector Module
 Coleta notícias de IA de múltiplas fontes: APIs, RSS feeds, web scraping
 """
 
+import os
+import html
+import re
 import json
-import logging
 import time
+import asyncio
+import logging
+import threading
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, fields
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit, urlunsplit
+from bisect import bisect_right
+from contextlib import suppress
+from operator import attrgetter
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import feedparser
 from bs4 import BeautifulSoup
 
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser  # selectolax < 1.0 (backend Modest)
+    except ImportError:
+        HTMLParser = None
+
+# Parser de HTML do BeautifulSoup: lxml (C) quando instalado
+try:
+    import lxml  # noqa: F401
+    _BS4_PARSER = 'lxml'
+except ImportError:
+    _BS4_PARSER = 'html.parser'
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+_relevance = attrgetter('relevance_score')
+
+# Máximo de hosts RSS buscados simultaneamente (threads) e de downloads em voo (aiohttp)
+_RSS_MAX_WORKERS = 8
+_RSS_MAX_CONCURRENCY = 16
+_RSS_TIMEOUT = 30
+_RSS_HEADERS = {'User-Agent': feedparser.USER_AGENT}
+# Só usamos as primeiras entradas: o corpo do feed é lido até este tamanho
+_RSS_MAX_BYTES = 256 * 1024
+_RSS_CHUNK_SIZE = 64 * 1024
+# Cache entre execuções: feed_url -> validadores HTTP (ETag/Last-Modified) + entradas reduzidas (na raiz do repo, independente do cwd)
+_RSS_CACHE_FILE = Path(__file__).resolve().parent.parent / '.cache' / 'rss_cache.json'
+
+# Sites de scraping buscados simultaneamente (requisições ao mesmo host continuam espaçadas)
+_WEB_MAX_WORKERS = 4
+
+# User-Agent padrão das requisições de scraping
+_BROWSER_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Campos de data do feedparser, em ordem de preferência
+_DATE_FIELDS = ('published_parsed', 'updated_parsed', 'created_parsed')
+
+# Keywords de alta prioridade (foco principal + Thais Martan)
+_HIGH_PRIORITY = [
+    'chatgpt', 'cursor', 'lovable', 'openai', 'anthropic', 'claude',
+    'thais martan', 'martan', 'thaismartan'  # Alta prioridade para conteúdo da Thais
+]
+
+# Keywords de média prioridade (IA/ML - inglês)
+_MEDIUM_PRIORITY_EN = [
+    'ai', 'artificial intelligence', 'machine learning', 'deep learning',
+    'neural network', 'gpt', 'llm', 'large language model', 'robotics'
+]
+
+# Keywords de média prioridade (IA/ML - português)
+_MEDIUM_PRIORITY_PT = [
+    'inteligência artificial', 'aprendizado máquina', 'aprendizado profundo',
+    'rede neural', 'ia', 'machine learning', 'deep learning', 'robótica',
+    'automação', 'tecnologia', 'inovação', 'startup', 'empreendedorismo'
+]
+
+# Keywords de baixa prioridade (tech geral - mais permissivo)
+_LOW_PRIORITY = [
+    'tech', 'technology', 'software', 'hardware', 'digital',
+    'tecnologia', 'software', 'hardware', 'digital', 'inovação'
+]
+
+# (keyword, peso) na ordem original; repetições entre listas somam de novo
+_WEIGHTED_KEYWORDS = (
+    [(kw, 1.5) for kw in _HIGH_PRIORITY]  # Bônus extra para conteúdo prioritário
+    + [(kw, 0.5) for kw in _MEDIUM_PRIORITY_EN + _MEDIUM_PRIORITY_PT]
+    + [(kw, 0.2) for kw in _LOW_PRIORITY]
+)
+
+# keyword -> ((posição em _WEIGHTED_KEYWORDS, peso), ...), para somar só as encontradas
+_KEYWORD_WEIGHTS: Dict[str, List[Tuple[int, float]]] = {}
+for _position, (_keyword, _weight) in enumerate(_WEIGHTED_KEYWORDS):
+    _KEYWORD_WEIGHTS.setdefault(_keyword, []).append((_position, _weight))
+del _position, _keyword, _weight
+
+# Termos de IA buscados entre as primeiras palavras (comparação por palavra inteira)
+_TITLE_INDICATORS = (
+    'ai', 'intelligence', 'neural', 'learning', 'gpt', 'model',
+    'ia', 'inteligência', 'aprendizado', 'tecnologia'
+)
+
+_SOCIAL_KEYWORDS = frozenset(['linkedin', 'instagram', 'thais martan'])
+
+_PENALTY_KEYWORDS = frozenset([
+    'subscribe', 'newsletter', 'advertisement', 'sponsored',
+    'breaking news', 'exclusive', 'trending', 'viral'
+])
+
+_TECHNICAL_BONUS = frozenset([
+    'algorithm', 'training data', 'fine-tuning', 'prompt engineering',
+    'reinforcement learning', 'transformer', 'attention mechanism',
+    'machine translation', 'computer vision', 'nlp', 'mlops'
+])
+
+class _KeywordMatcher:
+    """Encontra quais keywords ocorrem (como substring) num texto já em minúsculas"""
+
+    def __init__(self, keywords):
+        self.keywords = frozenset(keywords)
+        self._automaton = None
+        if ahocorasick is not None:
+            # Aho-Corasick: uma passada em C pelo texto para todas as keywords
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def find(self, text_lower: str) -> frozenset:
+        if self._automaton is not None:
+            return frozenset(keyword for _, keyword in self._automaton.iter(text_lower))
+        return frozenset(keyword for keyword in self.keywords if keyword in text_lower)
+
+    def find_many(self, texts_lower: List[str]) -> List[frozenset]:
+        """find() para vários textos; com o autômato, percorre todos numa única passada"""
+        if self._automaton is None or len(texts_lower) < 2:
+            return [self.find(text) for text in texts_lower]
+
+        # Textos unidos por \x00 (que nenhuma keyword contém, então não há match entre
+        # textos); cada match é atribuído ao texto pela posição final
+        bounds = []
+        offset = 0
+        for text in texts_lower:
+            offset += len(text)
+            bounds.append(offset)
+            offset += 1
+        found = [set() for _ in texts_lower]
+        for end, keyword in self._automaton.iter('\x00'.join(texts_lower)):
+            found[bisect_right(bounds, end)].add(keyword)
+        return [frozenset(keywords) for keywords in found]
+
+_KEYWORD_MATCHER = _KeywordMatcher(
+    [kw for kw, _ in _WEIGHTED_KEYWORDS]
+    + list(_SOCIAL_KEYWORDS) + list(_PENALTY_KEYWORDS) + list(_TECHNICAL_BONUS)
+)
+
+def _create_session() -> requests.Session:
+    """Session HTTP compartilhada: reaproveita conexões (keep-alive) e repete falhas temporárias"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504]),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    # Accept-Encoding padrão do requests já pede gzip/deflate, e br quando brotli está instalado
+    session.headers['User-Agent'] = _BROWSER_USER_AGENT
+    return session
+
+def _normalize_url(url: str) -> str:
+    """Chave de deduplicação da URL: sem fragmento, parâmetros utm_* nem barra final"""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+    query = '&'.join(p for p in parts.query.split('&') if p and not p.lower().startswith('utm_'))
+    path = parts.path.rstrip('/')
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+def _parse_feed_body(body: bytes, headers, feed_url: str):
+    """Parse de um feed já baixado; repassa charset/idioma e a URL base ao feedparser"""
+    response_headers = {'content-location': feed_url}
+    for name in ('content-type', 'content-language'):
+        value = headers.get(name)
+        if value:
+            response_headers[name] = value
+    return feedparser.parse(body, response_headers=response_headers)
+
+_TAG_RE = re.compile(r'<[^>]*>')
+
+def _strip_html(text: str) -> str:
+    """Texto puro de um resumo RSS em HTML (tags removidas, entidades decodificadas)"""
+    if '<' not in text and '&' not in text:
+        return text
+    if HTMLParser is not None:
+        text = HTMLParser(text).text(separator=' ')
+    else:
+        text = html.unescape(_TAG_RE.sub(' ', text))
+    return ' '.join(text.split())
+
+def _parse_techcrunch_articles(content: bytes) -> List[Tuple[str, str, str]]:
+    """Extrai (título, link, resumo) dos 5 primeiros artigos; usa selectolax se instalado"""
+    articles = []
+
+    if HTMLParser is not None:
+        for article in HTMLParser(content).css('article')[:5]:
+            title_elem = article.css_first('h2') or article.css_first('h3')
+            link_elem = article.css_first('a[href]')
+            if not title_elem or not link_elem:
+                continue
+            summary_elem = article.css_first('p')
+            summary = summary_elem.text().strip()[:200] if summary_elem else ""
+            articles.append((title_elem.text().strip(), link_elem.attributes.get('href') or '', summary))
+        return articles
+
+    soup = BeautifulSoup(content, _BS4_PARSER)
+    for article in soup.find_all('article', limit=5):
+        title_elem = article.find('h2') or article.find('h3')
+        link_elem = article.find('a', href=True)
+        if not title_elem or not link_elem:
+            continue
+        summary_elem = article.find('p')
+        summary = summary_elem.get_text().strip()[:200] if summary_elem else ""
+        articles.append((title_elem.get_text().strip(), link_elem['href'], summary))
+    return articles
+
+_LINKEDIN_POST_CSS = 'div[class*="feed" i], article[class*="feed" i]'
+_LINKEDIN_TEXT_CSS = ', '.join(
+    f'{tag}[class*="{word}" i]' for tag in ('p', 'span') for word in ('text', 'content')
+)
+
+def _parse_linkedin_posts(content: bytes) -> List[str]:
+    """Textos (até 200 chars) dos 2 primeiros blocos de feed da página; usa selectolax se instalado"""
+    texts = []
+
+    if HTMLParser is not None:
+        for post in HTMLParser(content).css(_LINKEDIN_POST_CSS)[:2]:
+            text_elem = post.css_first(_LINKEDIN_TEXT_CSS)
+            if text_elem:
+                texts.append(text_elem.text().strip()[:200])
+        return texts
+
+    soup = BeautifulSoup(content, _BS4_PARSER)
+    posts = soup.find_all(['div', 'article'], class_=lambda x: x and 'feed' in x.lower(), limit=2)
+    for post in posts:
+        text_elem = post.find(['p', 'span'], class_=lambda x: x and ('text' in x.lower() or 'content' in x.lower()))
+        if text_elem:
+            texts.append(text_elem.get_text().strip()[:200])
+    return texts
+
+def _parse_instagram_meta(content: bytes) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """Atributos das metatags og:title e description (None se ausentes); usa selectolax se instalado"""
+    if HTMLParser is not None:
+        tree = HTMLParser(content)
+        meta_title = tree.css_first('meta[property="og:title"]')
+        meta_desc = tree.css_first('meta[name="description"]')
+        return (
+            meta_title.attributes if meta_title else None,
+            meta_desc.attributes if meta_desc else None,
+        )
+
+    soup = BeautifulSoup(content, _BS4_PARSER)
+    meta_title = soup.find('meta', attrs={'property': 'og:title'})
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    return (meta_title.attrs if meta_title else None, meta_desc.attrs if meta_desc else None)
+
+def _with_slots(cls):
+    """Recria a dataclass com __slots__ (o mesmo que dataclass(slots=True), que exige Python 3.10)"""
+    names = tuple(f.name for f in fields(cls))
+    namespace = {k: v for k, v in cls.__dict__.items() if k not in names + ('__dict__', '__weakref__')}
+    namespace['__slots__'] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+@_with_slots
 @dataclass
 class NewsItem:
     """Estrutura de dados para uma notícia"""
@@ -36,6 +314,22 @@ class NewsCollector:
         ]
         self.max_age_hours = config.get('news', {}).get('max_age_hours', 24)
         self.request_delay = config.get('processing', {}).get('request_delay', 1.0)
+        self.session = _create_session()
+        self.cache_path = _RSS_CACHE_FILE
+        self._rss_cache: Dict[str, Dict] = {}
+        # host -> (lock, horário da última requisição) para o rate limiting do scraping
+        self._host_slots: Dict[str, list] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        """Fecha as conexões mantidas pela session HTTP"""
+        self.session.close()
 
     def collect_all(self) -> List[NewsItem]:
         """Coleta notícias de todas as fontes configuradas"""
@@ -43,32 +337,31 @@ class NewsCollector:
 
         logger.info("🔍 Starting news collection from all sources")
 
-        # Coleta de APIs
-        try:
-            api_news = self._collect_from_apis()
-            all_news.extend(api_news)
-            logger.info(f"📡 Collected {len(api_news)} items from APIs")
-        except Exception as e:
-            logger.error(f"❌ API collection failed: {e}")
+        # As três fases acessam hosts distintos e são limitadas por rede: rodam em
+        # paralelo e os resultados são registrados na ordem original
+        phases = [
+            ('APIs', '📡', 'API collection failed', self._collect_from_apis),
+            ('RSS feeds', '📰', 'RSS collection failed', self._collect_from_rss),
+            ('web scraping', '🌐', 'Web scraping failed', self._collect_from_web),
+        ]
+        with ThreadPoolExecutor(max_workers=len(phases)) as executor:
+            futures = [executor.submit(collect) for _, _, _, collect in phases]
 
-        # Coleta de RSS feeds
-        try:
-            rss_news = self._collect_from_rss()
-            all_news.extend(rss_news)
-            logger.info(f"📰 Collected {len(rss_news)} items from RSS feeds")
-        except Exception as e:
-            logger.error(f"❌ RSS collection failed: {e}")
+            for (label, emoji, error_msg, _), future in zip(phases, futures):
+                try:
+                    items = future.result()
+                    all_news.extend(items)
+                    logger.info(f"{emoji} Collected {len(items)} items from {label}")
+                except Exception as e:
+                    logger.error(f"❌ {error_msg}: {e}")
 
-        # Coleta via web scraping
-        try:
-            web_news = self._collect_from_web()
-            all_news.extend(web_news)
-            logger.info(f"🌐 Collected {len(web_news)} items from web scraping")
-        except Exception as e:
-            logger.error(f"❌ Web scraping failed: {e}")
+        # Mesma notícia em vários feeds: descarta antes do cálculo de relevância
+        unique_news = self._remove_duplicates(all_news)
+        if len(unique_news) < len(all_news):
+            logger.info(f"🗑️ Removed {len(all_news) - len(unique_news)} duplicated items")
 
         # Filtragem por data e relevância
-        filtered_news = self._filter_by_date_and_relevance(all_news)
+        filtered_news = self._filter_by_date_and_relevance(unique_news)
         logger.info(f"🎯 Filtered to {len(filtered_news)} relevant items")
 
         return filtered_news
@@ -102,130 +395,288 @@ class NewsCollector:
         return news_items
 
     def _collect_from_rss(self) -> List[NewsItem]:
-        """Coleta de feeds RSS com melhor rate limiting"""
-        news_items = []
+        """Coleta de feeds RSS em paralelo, com rate limiting apenas entre feeds do mesmo host"""
         rss_feeds = self.sources.get('rss_feeds', {})
-
         total_feeds = len(rss_feeds)
-        for i, (source_name, feed_url) in enumerate(rss_feeds.items(), 1):
-            try:
-                logger.info(f"📡 [{i}/{total_feeds}] Fetching RSS from {source_name}")
-
-                # Rate limiting inteligente - delay maior entre feeds
-                if i > 1:
-                    time.sleep(self.request_delay * 2)  # Delay extra entre feeds diferentes
-
-                # Parse RSS feed
-                feed = feedparser.parse(feed_url)
-
-                if feed.entries:
-                    items_from_feed = 0
-                    for entry in feed.entries[:3]:  # Reduzido para 3 por feed para evitar sobrecarga
-                        published = self._parse_rss_date(entry)
-                        if published:
-                            item = NewsItem(
-                                title=entry.title,
-                                summary=getattr(entry, 'summary', entry.title)[:300],
-                                url=entry.link,
-                                source=source_name,
-                                published_at=published
-                            )
-                            news_items.append(item)
-                            items_from_feed += 1
-
-                    logger.info(f"   ✅ Collected {items_from_feed} items from {source_name}")
-                else:
-                    logger.warning(f"   ⚠️ No entries found in {source_name}")
-
-            except Exception as e:
-                logger.error(f"❌ RSS collection failed for {source_name}: {e}")
+        if not total_feeds:
+            return []
+
+        # Feeds do mesmo host ficam na mesma tarefa (sequenciais, com delay);
+        # hosts diferentes são buscados em paralelo
+        by_host: Dict[str, List[Tuple[int, Tuple[str, str]]]] = {}
+        for i, feed in enumerate(rss_feeds.items(), 1):
+            by_host.setdefault(urlsplit(feed[1]).netloc.lower(), []).append((i, feed))
+
+        self._rss_cache = self._load_rss_cache()
+        if aiohttp is not None:
+            per_feed = asyncio.run(self._collect_from_rss_async(by_host, total_feeds))
+        else:
+            per_feed = self._collect_from_rss_threaded(by_host, total_feeds)
+        # Só feeds ainda configurados permanecem no cache
+        self._save_rss_cache({url: self._rss_cache[url] for url in rss_feeds.values() if url in self._rss_cache})
+
+        # Mantém a ordem de configuração dos feeds (desempates estáveis na ordenação)
+        news_items = []
+        for i in sorted(per_feed):
+            news_items.extend(per_feed[i])
+        return news_items
+
+    def _collect_from_rss_threaded(self, by_host: Dict, total_feeds: int) -> Dict[int, List[NewsItem]]:
+        """Busca os grupos de feeds por host em threads (sem aiohttp)"""
+        def fetch_host(host_feeds):
+            results = []
+            for n, (i, feed) in enumerate(host_feeds):
+                if n:
+                    time.sleep(self.request_delay * 2)  # Delay extra entre feeds do mesmo host
+                logger.info(f"📡 [{i}/{total_feeds}] Fetching RSS from {feed[0]}")
+                results.append((i, self._fetch_single_feed(feed)))
+            return results
+
+        per_feed = {}
+        with ThreadPoolExecutor(max_workers=min(_RSS_MAX_WORKERS, len(by_host))) as executor:
+            futures = [executor.submit(fetch_host, host_feeds) for host_feeds in by_host.values()]
+            for future in as_completed(futures):
+                per_feed.update(future.result())
+        return per_feed
+
+    async def _collect_from_rss_async(self, by_host: Dict, total_feeds: int) -> Dict[int, List[NewsItem]]:
+        """Busca todos os grupos de feeds por host numa única event loop (aiohttp)"""
+        limit = asyncio.Semaphore(_RSS_MAX_CONCURRENCY)
+        timeout = aiohttp.ClientTimeout(total=_RSS_TIMEOUT)
+
+        async def fetch_host(session, host_feeds):
+            results = []
+            for n, (i, feed) in enumerate(host_feeds):
+                if n:
+                    await asyncio.sleep(self.request_delay * 2)  # Delay extra entre feeds do mesmo host
+                logger.info(f"📡 [{i}/{total_feeds}] Fetching RSS from {feed[0]}")
+                async with limit:
+                    results.append((i, await self._fetch_single_feed_async(session, feed)))
+            return results
+
+        # Pool de conexões do mesmo tamanho do limite de downloads em voo
+        connector = aiohttp.TCPConnector(limit=_RSS_MAX_CONCURRENCY)
+        async with aiohttp.ClientSession(timeout=timeout, headers=_RSS_HEADERS, connector=connector) as session:
+            # Falha inesperada num host não descarta os feeds já coletados dos demais
+            groups = await asyncio.gather(
+                *(fetch_host(session, hf) for hf in by_host.values()), return_exceptions=True
+            )
+
+        per_feed = {}
+        for host, group in zip(by_host, groups):
+            if isinstance(group, BaseException):
+                logger.error(f"❌ RSS collection failed for host {host}: {group}")
+                continue
+            per_feed.update(group)
+        return per_feed
+
+    def _fetch_single_feed(self, feed: Tuple[str, str]) -> List[NewsItem]:
+        """Baixa e converte um único feed RSS (source_name, feed_url) em NewsItems"""
+        source_name, feed_url = feed
+
+        try:
+            # Download pela session compartilhada (keep-alive entre feeds do mesmo host)
+            # Streaming até _RSS_MAX_BYTES (as primeiras entradas ficam no início do XML)
+            headers = self._conditional_headers(feed_url)
+            with self.session.get(feed_url, headers=headers, timeout=_RSS_TIMEOUT, stream=True) as response:
+                if response.status_code == 304:
+                    return self._cached_feed_items(source_name, feed_url)
+                body = bytearray()
+                for chunk in response.iter_content(_RSS_CHUNK_SIZE):
+                    body += chunk
+                    if len(body) >= _RSS_MAX_BYTES:
+                        break
+                headers = response.headers
+                status = response.status_code
+            parsed = _parse_feed_body(bytes(body[:_RSS_MAX_BYTES]), headers, feed_url)
+            entries = self._feed_entries(parsed)
+            self._remember_feed(feed_url, status, headers, entries)
+            return self._items_from_entries(source_name, entries)
+        except Exception as e:
+            logger.error(f"❌ RSS collection failed for {source_name}: {e}")
+            return []
+
+    async def _fetch_single_feed_async(self, session, feed: Tuple[str, str]) -> List[NewsItem]:
+        """Versão aiohttp de _fetch_single_feed: baixa na event loop, faz o parse numa thread"""
+        source_name, feed_url = feed
+
+        try:
+            async with session.get(feed_url, headers=self._conditional_headers(feed_url)) as response:
+                if response.status == 304:
+                    return self._cached_feed_items(source_name, feed_url)
+                body = bytearray()
+                while len(body) < _RSS_MAX_BYTES:
+                    chunk = await response.content.read(_RSS_MAX_BYTES - len(body))
+                    if not chunk:
+                        break
+                    body += chunk
+                headers = response.headers
+                status = response.status
+            body = bytes(body)
+            parsed = await asyncio.to_thread(_parse_feed_body, body, headers, feed_url)
+            entries = self._feed_entries(parsed)
+            self._remember_feed(feed_url, status, headers, entries)
+            return self._items_from_entries(source_name, entries)
+        except Exception as e:
+            logger.error(f"❌ RSS collection failed for {source_name}: {e}")
+            return []
+
+    def _feed_entries(self, parsed) -> List[Dict]:
+        """Primeiras entradas de um feed já parseado, em dicts serializáveis para o cache"""
+        entries = []
+        for entry in parsed.entries[:3]:  # Reduzido para 3 por feed para evitar sobrecarga
+            link = entry.get('link')
+            if not link:
+                continue  # Sem link não há o que enviar
+            published = self._parse_rss_date(entry)
+            entries.append({
+                'title': entry.title,
+                'summary': _strip_html(entry.get('summary') or entry.title)[:300],
+                'url': link,
+                # None: feed sem data, vale o horário da coleta (também vindo do cache)
+                'published_at': published.isoformat() if published else None,
+            })
+        return entries
+
+    def _items_from_entries(self, source_name: str, entries: List[Dict]) -> List[NewsItem]:
+        """Converte as entradas reduzidas de um feed em NewsItems"""
+        news_items = [
+            NewsItem(
+                title=entry['title'],
+                summary=entry['summary'],
+                url=entry['url'],
+                source=source_name,
+                published_at=datetime.fromisoformat(entry['published_at']) if entry['published_at'] else datetime.now()
+            )
+            for entry in entries
+        ]
+
+        if news_items:
+            logger.info(f"   ✅ Collected {len(news_items)} items from {source_name}")
+        else:
+            logger.warning(f"   ⚠️ No entries found in {source_name}")
 
         return news_items
 
+    def _conditional_headers(self, feed_url: str) -> Dict[str, str]:
+        """Headers do feed com If-None-Match/If-Modified-Since da última execução"""
+        headers = dict(_RSS_HEADERS)
+        cached = self._rss_cache.get(feed_url)
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    def _cached_feed_items(self, source_name: str, feed_url: str) -> List[NewsItem]:
+        """Feed não modificado (304): reaproveita as entradas do cache"""
+        logger.info(f"   ♻️ {source_name} not modified, using cached entries")
+        return self._items_from_entries(source_name, self._rss_cache[feed_url]['items'])
+
+    def _remember_feed(self, feed_url: str, status: int, headers, entries: List[Dict]):
+        """Guarda validadores e entradas do feed; sem ETag/Last-Modified não há o que revalidar"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if status == 200 and (etag or last_modified):
+            self._rss_cache[feed_url] = {'etag': etag, 'last_modified': last_modified, 'items': entries}
+        else:
+            self._rss_cache.pop(feed_url, None)
+
+    def _load_rss_cache(self) -> Dict[str, Dict]:
+        """Carrega o cache de feeds da execução anterior (vazio se ausente ou corrompido)"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring RSS cache {self.cache_path}: {e}")
+            return {}
+
+    def _save_rss_cache(self, cache: Dict[str, Dict]):
+        """Grava o cache de feeds de forma atômica"""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save RSS cache: {e}")
+
     def _collect_from_web(self) -> List[NewsItem]:
         """Web scraping para sites sem RSS e redes sociais"""
         news_items = []
 
         # Configurado via config/sources.json
         scraping_sites = self.sources.get('web_scraping', {}).get('sites', [])
+        scrapers = {
+            'linkedin': self._scrape_linkedin_profile,
+            'instagram': self._scrape_instagram_profile,
+        }
 
+        tasks = []
         for site_config in scraping_sites:
             if not site_config.get('enabled', False):
                 continue
 
             site_name = site_config['name']
-            site_url = site_config['url']
             site_type = site_config['type']
+            scrape = scrapers.get(site_type)
+            if scrape is None:
+                logger.warning(f"Unsupported scraping type: {site_type}")
+                continue
 
-            try:
-                logger.info(f"🌐 Scraping {site_name} ({site_type})")
-
-                if site_type == 'linkedin':
-                    items = self._scrape_linkedin_profile(site_config)
-                elif site_type == 'instagram':
-                    items = self._scrape_instagram_profile(site_config)
-                else:
-                    logger.warning(f"Unsupported scraping type: {site_type}")
-                    continue
+            logger.info(f"🌐 Scraping {site_name} ({site_type})")
+            tasks.append((site_name, scrape, (site_config,)))
 
-                news_items.extend(items)
-                logger.info(f"   ✅ Collected {len(items)} items from {site_name}")
+        # Fallback: TechCrunch AI section (se não tiver RSS bom)
+        tasks.append(('TechCrunch', self._scrape_techcrunch_ai, ()))
 
-            except Exception as e:
-                logger.warning(f"❌ Web scraping failed for {site_name}: {e}")
+        # Sites independentes rodam em paralelo; resultados na ordem original
+        with ThreadPoolExecutor(max_workers=min(_WEB_MAX_WORKERS, len(tasks))) as executor:
+            futures = [executor.submit(scrape, *args) for _, scrape, args in tasks]
 
-        # Fallback: TechCrunch AI section (se não tiver RSS bom)
-        try:
-            techcrunch_items = self._scrape_techcrunch_ai()
-            news_items.extend(techcrunch_items)
-        except Exception as e:
-            logger.warning(f"TechCrunch scraping failed: {e}")
+            for (site_name, _, _), future in zip(tasks, futures):
+                try:
+                    items = future.result()
+                    news_items.extend(items)
+                    logger.info(f"   ✅ Collected {len(items)} items from {site_name}")
+                except Exception as e:
+                    logger.warning(f"❌ Web scraping failed for {site_name}: {e}")
 
         return news_items
 
+    def _throttled_get(self, url: str, delay: float, **kwargs) -> requests.Response:
+        """GET pela session respeitando `delay` segundos desde a última requisição ao mesmo host"""
+        slot = self._host_slots.setdefault(urlsplit(url).netloc.lower(), [threading.Lock(), None])
+        with slot[0]:
+            if slot[1] is not None:
+                wait = slot[1] + delay - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+            try:
+                return self.session.get(url, **kwargs)
+            finally:
+                slot[1] = time.monotonic()
+
     def _scrape_techcrunch_ai(self) -> List[NewsItem]:
         """Web scraping da seção AI do TechCrunch"""
         items = []
 
         try:
             url = "https://techcrunch.com/category/artificial-intelligence/"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
 
-            time.sleep(self.request_delay)
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._throttled_get(url, self.request_delay, timeout=10)
 
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-
-                # Encontra artigos na página
-                articles = soup.find_all('article', limit=5)
-
-                for article in articles:
+                for title, url, summary in _parse_techcrunch_articles(response.content):
                     try:
-                        # Extrai título
-                        title_elem = article.find('h2') or article.find('h3')
-                        if not title_elem:
-                            continue
-
-                        title = title_elem.get_text().strip()
-
-                        # Extrai link
-                        link_elem = article.find('a', href=True)
-                        if not link_elem:
-                            continue
-
-                        url = link_elem['href']
                         if not url.startswith('http'):
                             url = f"https://techcrunch.com{url}"
 
-                        # Extrai resumo (se disponível)
-                        summary = ""
-                        summary_elem = article.find('p')
-                        if summary_elem:
-                            summary = summary_elem.get_text().strip()[:200]
-
                         # Cria item
                         item = NewsItem(
                             title=title,
@@ -253,46 +704,29 @@ class NewsCollector:
         try:
             url = site_config['url']
             headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
                 'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
                 'Upgrade-Insecure-Requests': '1',
             }
 
-            time.sleep(self.request_delay * 2)  # Extra delay para redes sociais
-            response = requests.get(url, headers=headers, timeout=15)
+            # Extra delay para redes sociais (entre requisições ao mesmo host)
+            response = self._throttled_get(url, self.request_delay * 2, headers=headers, timeout=15)
 
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-
                 # ⚠️ AVISO: Este scraping é limitado e pode violar termos de serviço
                 # Apenas para fins educacionais - não recomendado para produção
 
                 # Procurar posts recentes (muito limitado devido a proteções do LinkedIn)
-                posts = soup.find_all(['div', 'article'], class_=lambda x: x and 'feed' in x.lower(), limit=2)
-
-                for post in posts:
-                    try:
-                        # Extrair texto do post
-                        text_elem = post.find(['p', 'span'], class_=lambda x: x and ('text' in x.lower() or 'content' in x.lower()))
-                        if text_elem:
-                            text = text_elem.get_text().strip()[:200]
-
-                            # Criar item (com baixa prioridade por ser scraping limitado)
-                            item = NewsItem(
-                                title=f"LinkedIn Post - {site_config['name']}",
-                                summary=text,
-                                url=url,
-                                source=f"LinkedIn ({site_config['name']})",
-                                published_at=datetime.now()
-                            )
-                            items.append(item)
-
-                    except Exception as e:
-                        logger.debug(f"Error parsing LinkedIn post: {e}")
-                        continue
+                for text in _parse_linkedin_posts(response.content):
+                    # Criar item (com baixa prioridade por ser scraping limitado)
+                    item = NewsItem(
+                        title=f"LinkedIn Post - {site_config['name']}",
+                        summary=text,
+                        url=url,
+                        source=f"LinkedIn ({site_config['name']})",
+                        published_at=datetime.now()
+                    )
+                    items.append(item)
 
                 if not items:
                     # Fallback: apenas indicar que há atividade no perfil
@@ -320,26 +754,20 @@ class NewsCollector:
         try:
             url = site_config['url']
             headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
                 'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
                 'Upgrade-Insecure-Requests': '1',
             }
 
-            time.sleep(self.request_delay * 2)  # Extra delay para redes sociais
-            response = requests.get(url, headers=headers, timeout=15)
+            # Extra delay para redes sociais (entre requisições ao mesmo host)
+            response = self._throttled_get(url, self.request_delay * 2, headers=headers, timeout=15)
 
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-
                 # ⚠️ AVISO: Instagram tem proteções anti-scraping robustas
                 # Este método é muito limitado e pode não funcionar
 
                 # Tentar extrair metatags (mais confiável que scraping direto)
-                meta_desc = soup.find('meta', attrs={'name': 'description'})
-                meta_title = soup.find('meta', attrs={'property': 'og:title'})
+                meta_title, meta_desc = _parse_instagram_meta(response.content)
 
                 if meta_desc or meta_title:
                     title = meta_title.get('content', 'Instagram Post') if meta_title else 'Instagram Activity'
@@ -362,127 +790,122 @@ class NewsCollector:
 
         return items
 
+    def _remove_duplicates(self, news_items: List[NewsItem]) -> List[NewsItem]:
+        """Remove notícias repetidas (mesma URL normalizada ou mesmo título), mantendo a primeira"""
+        seen_urls = set()
+        seen_titles = set()
+        unique = []
+
+        for item in news_items:
+            url_key = _normalize_url(item.url)
+            title_key = ' '.join(item.title.lower().split())
+            if url_key in seen_urls or (title_key and title_key in seen_titles):
+                continue
+            seen_urls.add(url_key)
+            if title_key:
+                seen_titles.add(title_key)
+            unique.append(item)
+
+        return unique
+
     def _filter_by_date_and_relevance(self, news_items: List[NewsItem]) -> List[NewsItem]:
         """Filtra notícias por data (24h) e relevância"""
-        cutoff_date = datetime.now() - timedelta(hours=self.max_age_hours)
+        # Um único "agora" para todos os itens
+        now = datetime.now()
+        future_cutoff = now + timedelta(hours=1)
+        ancient_cutoff = now - timedelta(days=7)
+        cutoff_date = now - timedelta(hours=self.max_age_hours)
+        recent = []
         filtered = []
 
         for item in news_items:
             # Filtro de data - mais permissivo com datas inválidas/futuras
             item_date = item.published_at
-            is_recent = True
 
             # Se data é muito futura (> 1h do presente), considerar como erro e aceitar
-            if item_date > datetime.now() + timedelta(hours=1):
+            if item_date > future_cutoff:
                 logger.debug(f"Future date detected for '{item.title}', accepting anyway")
                 is_recent = True
             # Se data é muito antiga (> 7 dias), rejeitar
-            elif item_date < datetime.now() - timedelta(days=7):
+            elif item_date < ancient_cutoff:
                 is_recent = False
             # Caso normal: verificar cutoff
             else:
                 is_recent = item_date >= cutoff_date
 
             if is_recent:
-                # Cálculo de relevância baseado em keywords
-                relevance = self._calculate_relevance(item.title + " " + item.summary)
-                if relevance > 0.3:  # Threshold ajustado (mais permissivo para conteúdo em PT e Thais)
-                    item.relevance_score = relevance
-                    filtered.append(item)
+                recent.append(item)
+
+        # Cálculo de relevância baseado em keywords, em lote para todos os itens recentes
+        texts = [(item.title + " " + item.summary).lower() for item in recent]
+        for item, relevance in zip(recent, self._calculate_relevance_batch(texts)):
+            if relevance > 0.3:  # Threshold ajustado (mais permissivo para conteúdo em PT e Thais)
+                item.relevance_score = relevance
+                filtered.append(item)
 
         # Ordena por relevância
-        filtered.sort(key=lambda x: x.relevance_score, reverse=True)
+        filtered.sort(key=_relevance, reverse=True)
         return filtered
 
-    def _calculate_relevance(self, text: str) -> float:
-        """Calcula score de relevância baseado em keywords (inglês + português)"""
-        text_lower = text.lower()
-        score = 0.0
+    def _calculate_relevance(self, text_lower: str) -> float:
+        """Calcula score de relevância baseado em keywords (inglês + português); recebe o texto já em minúsculas"""
+        return self._score_matches(text_lower, _KEYWORD_MATCHER.find(text_lower))
 
-        # Keywords de alta prioridade (foco principal + Thais Martan)
-        high_priority = [
-            'chatgpt', 'cursor', 'lovable', 'openai', 'anthropic', 'claude',
-            'thais martan', 'martan', 'thaismartan'  # Alta prioridade para conteúdo da Thais
-        ]
-        for keyword in high_priority:
-            if keyword in text_lower:
-                score += 1.5  # Bônus extra para conteúdo prioritário
-
-        # Keywords de média prioridade (IA/ML - inglês)
-        medium_priority_en = [
-            'ai', 'artificial intelligence', 'machine learning', 'deep learning',
-            'neural network', 'gpt', 'llm', 'large language model', 'robotics'
-        ]
-        for keyword in medium_priority_en:
-            if keyword in text_lower:
-                score += 0.5
-
-        # Keywords de média prioridade (IA/ML - português)
-        medium_priority_pt = [
-            'inteligência artificial', 'aprendizado máquina', 'aprendizado profundo',
-            'rede neural', 'ia', 'machine learning', 'deep learning', 'robótica',
-            'automação', 'tecnologia', 'inovação', 'startup', 'empreendedorismo'
-        ]
-        for keyword in medium_priority_pt:
-            if keyword in text_lower:
-                score += 0.5
-
-        # Keywords de baixa prioridade (tech geral - mais permissivo)
-        low_priority = [
-            'tech', 'technology', 'software', 'hardware', 'digital',
-            'tecnologia', 'software', 'hardware', 'digital', 'inovação'
+    def _calculate_relevance_batch(self, texts_lower: List[str]) -> List[float]:
+        """Calcula a relevância de vários textos (minúsculas) com uma única varredura de keywords"""
+        return [
+            self._score_matches(text_lower, matched)
+            for text_lower, matched in zip(texts_lower, _KEYWORD_MATCHER.find_many(texts_lower))
         ]
-        for keyword in low_priority:
-            if keyword in text_lower:
-                score += 0.2
+
+    def _score_matches(self, text_lower: str, matched: frozenset) -> float:
+        """Soma os pesos das keywords encontradas e os bônus/penalidades do texto"""
+        score = 0.0
+
+        # Keywords de alta/média/baixa prioridade: só as encontradas, somadas na ordem
+        # original de _WEIGHTED_KEYWORDS para o resultado em float não mudar
+        weights = sorted(
+            entry for keyword in matched for entry in _KEYWORD_WEIGHTS.get(keyword, ())
+        )
+        for _, weight in weights:
+            score += weight
+
+        # Já saturado: os demais ajustes só somam, exceto a penalização de -0.3, então
+        # o resultado seria o teto de qualquer forma
+        if score - 0.3 >= 3.0:
+            return 3.0
 
         # Bônus para títulos com termos de IA (inglês + português)
-        title_indicators = [
-            'ai', 'intelligence', 'neural', 'learning', 'gpt', 'model',
-            'ia', 'inteligência', 'aprendizado', 'tecnologia'
-        ]
-        title_words = text_lower.split()[:10]  # Primeiras 10 palavras (aprox. título)
-        for word in title_indicators:
+        # Primeiras 10 palavras (aprox. título); maxsplit evita quebrar o texto inteiro
+        title_words = frozenset(text_lower.split(None, 10)[:10])
+        for word in _TITLE_INDICATORS:
             if word in title_words:
                 score += 0.3
 
         # Bônus para conteúdo de redes sociais (LinkedIn, Instagram da Thais)
-        if any(social in text_lower for social in ['linkedin', 'instagram', 'thais martan']):
+        if not matched.isdisjoint(_SOCIAL_KEYWORDS):
             score += 0.8  # Bônus significativo para conteúdo da Thais
 
         # Penalização para conteúdo genérico ou promocional
-        penalty_keywords = [
-            'subscribe', 'newsletter', 'advertisement', 'sponsored',
-            'breaking news', 'exclusive', 'trending', 'viral'
-        ]
-        if any(penalty in text_lower for penalty in penalty_keywords):
+        if not matched.isdisjoint(_PENALTY_KEYWORDS):
             score -= 0.3  # Penalização leve para conteúdo promocional
 
         # Bônus para conteúdo técnico específico
-        technical_bonus = [
-            'algorithm', 'training data', 'fine-tuning', 'prompt engineering',
-            'reinforcement learning', 'transformer', 'attention mechanism',
-            'machine translation', 'computer vision', 'nlp', 'mlops'
-        ]
-        technical_matches = sum(1 for tech in technical_bonus if tech in text_lower)
+        technical_matches = len(matched.intersection(_TECHNICAL_BONUS))
         score += min(technical_matches * 0.2, 0.8)  # Bônus até 0.8 para conteúdo técnico
 
         return min(max(score, 0.0), 3.0)  # Mínimo 0.0, máximo 3.0
 
     def _parse_rss_date(self, entry) -> Optional[datetime]:
         """Parse RSS date formats"""
-        date_fields = ['published_parsed', 'updated_parsed', 'created_parsed']
-
-        for field in date_fields:
-            if hasattr(entry, field) and getattr(entry, field):
-                try:
-                    time_tuple = getattr(entry, field)
+        for field in _DATE_FIELDS:
+            time_tuple = getattr(entry, field, None)
+            if time_tuple:
+                with suppress(TypeError, ValueError):
                     return datetime(*time_tuple[:6])
-                except:
-                    continue
 
-        # Fallback para data atual se não conseguir parsear
-        return datetime.now()
+        # Sem data parseável: quem chama usa o horário da coleta
+        return None
 
     def _fetch_openai_models(self) -> List[str]:
         """Fetch available models from OpenAI API"""
@@ -6,11 +6,16 @@ Envia mensagens formatadas via Telegram Bot API
 import json
 import logging
 import time
-from typing import List
+from typing import Iterable, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Intervalo mínimo entre mensagens ao mesmo chat (conta o tempo da própria requisição)
+_MIN_SEND_INTERVAL = 0.5
+
 class TelegramSender:
     """Enviador de mensagens via Telegram Bot API"""
 
@@ -19,14 +24,31 @@ class TelegramSender:
         self.chat_id = chat_id
         self.max_retries = max_retries
         self.base_url = f"https://api.telegram.org/bot{token}"
+        self._send_url = f"{self.base_url}/sendMessage"
+        self._get_me_url = f"{self.base_url}/getMe"
         self.session = requests.Session()
-
-    def send_messages(self, messages: List[str]) -> bool:
-        """Envia múltiplas mensagens com tratamento de erros"""
+        # Repete só falhas de conexão (a mensagem ainda não saiu); o resto fica com o retry próprio
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=4,
+            max_retries=Retry(total=2, connect=2, read=False, status=False, backoff_factor=0.3),
+        ))
+
+    def send_messages(self, messages: Iterable[str]) -> bool:
+        """Envia múltiplas mensagens com tratamento de erros (aceita lista ou gerador)"""
         success = True
+        total = f"/{len(messages)}" if hasattr(messages, '__len__') else ""
 
+        last_sent = None
         for i, message in enumerate(messages, 1):
-            logger.info(f"📤 Sending message {i}/{len(messages)}")
+            # Espaçamento entre mensagens para evitar rate limiting; a ordem no chat é mantida
+            if last_sent is not None:
+                wait = last_sent + _MIN_SEND_INTERVAL - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+            last_sent = time.monotonic()
+
+            logger.info(f"📤 Sending message {i}{total}")
 
             if not self._send_single_message(message):
                 success = False
@@ -34,16 +56,10 @@ class TelegramSender:
             else:
                 logger.info(f"✅ Message {i} sent successfully")
 
-            # Pequeno delay entre mensagens para evitar rate limiting
-            if i < len(messages):
-                time.sleep(0.5)
-
         return success
 
     def _send_single_message(self, text: str) -> bool:
         """Envia uma única mensagem com retry logic"""
-        url = f"{self.base_url}/sendMessage"
-
         payload = {
             'chat_id': self.chat_id,
             'text': text,
@@ -52,11 +68,12 @@ class TelegramSender:
         }
 
         for attempt in range(self.max_retries):
+            retry_after = None
             try:
                 logger.debug(f"Attempting to send message (attempt {attempt + 1})")
 
                 response = self.session.post(
-                    url,
+                    self._send_url,
                     json=payload,
                     timeout=30
                 )
@@ -69,6 +86,8 @@ class TelegramSender:
                         logger.error(f"Telegram API error: {result.get('description')}")
                 else:
                     logger.error(f"HTTP error {response.status_code}: {response.text}")
+                    if response.status_code == 429:
+                        retry_after = self._retry_after(response)
 
             except requests.exceptions.RequestException as e:
                 logger.error(f"Request failed: {e}")
@@ -78,17 +97,28 @@ class TelegramSender:
 
             # Wait before retry
             if attempt < self.max_retries - 1:
-                wait_time = 2 ** attempt  # Exponential backoff
+                # Flood control (429): espera o tempo pedido pelo Telegram; senão backoff exponencial
+                wait_time = retry_after or 2 ** attempt
                 logger.info(f"⏳ Retrying in {wait_time} seconds...")
                 time.sleep(wait_time)
 
         return False
 
+    def _retry_after(self, response) -> Optional[int]:
+        """Segundos de espera informados numa resposta 429 (parameters.retry_after ou header)"""
+        try:
+            return int(response.json()['parameters']['retry_after'])
+        except (ValueError, KeyError, TypeError):
+            pass
+        try:
+            return int(response.headers.get('Retry-After', ''))
+        except ValueError:
+            return None
+
     def test_connection(self) -> bool:
         """Testa conexão com Telegram API"""
         try:
-            url = f"{self.base_url}/getMe"
-            response = self.session.get(url, timeout=10)
+            response = self.session.get(self._get_me_url, timeout=10)
 
             if response.status_code == 200:
                 result = response.json()